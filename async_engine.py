@@ -0,0 +1,171 @@
+# async_engine.py
+
+import asyncio
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from driver_pool import OrderedResultMerger
+from logging_setup import log_message, log_debug, log_error
+
+class TokenBucket:
+    """
+    Token bucket that allows `rate` acquisitions per second with bursts of up to `capacity`.
+
+    Callers reserve a token and then sleep only as long as needed for it to become available,
+    so waiters are served in order and the lock is never held while sleeping.
+    """
+    def __init__(self, rate, capacity=1, clock=time.monotonic):
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Takes one token, possibly going into debt.
+
+        Returns:
+        - float: Seconds the caller must wait before using the token (0 if available now).
+        """
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    async def acquire(self):
+        """Waits until a token is available."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+class HostRateLimiter:
+    """Keeps one TokenBucket per host so each site is throttled independently."""
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket_for(self, url):
+        """Returns the bucket for the URL's host, creating it on first use."""
+        host = urlsplit(url).netloc
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(self.rate, self.capacity)
+            return bucket
+
+    async def acquire(self, url):
+        """Waits for a request slot on the URL's host."""
+        if self.rate <= 0:
+            return
+        await self.bucket_for(url).acquire()
+
+class AsyncScrapeEngine:
+    """
+    Schedules page scrapes on an asyncio event loop.
+
+    One worker coroutine per driver pulls tasks from a queue, waits for its host's rate limiter
+    and runs the blocking scrape in a thread. Throughput is set by the worker count and the
+    per-host rate rather than by fixed sleeps; pause and stop are awaitable events that can be
+    triggered from any thread.
+    """
+    def __init__(self, drivers, rate_limiter, log_text=None):
+        self.drivers = list(drivers)
+        self.rate_limiter = rate_limiter
+        self.log_text = log_text
+        self.loop = None
+        self.stop_requested = False
+        self.paused = False
+        self.stop_event = None
+        self.resume_event = None
+
+    def run(self, tasks, url_fn, scrape_fn, on_result):
+        """
+        Runs every task to completion (or until stopped) on a new event loop in the calling thread.
+
+        Parameters:
+        - tasks (list): Ordered tasks, e.g. page numbers.
+        - url_fn (callable): url_fn(task) -> URL used to pick the rate-limit bucket.
+        - scrape_fn (callable): Blocking scrape_fn(driver, task) -> list of rows.
+        - on_result (callable): on_result(task, rows), called once per task in task order.
+        """
+        asyncio.run(self._run(tasks, url_fn, scrape_fn, on_result))
+
+    def stop(self):
+        """Stops the engine; safe to call from any thread."""
+        self.stop_requested = True
+        self._call_in_loop(self._apply_state)
+
+    def set_paused(self, paused):
+        """Pauses or resumes the engine; safe to call from any thread."""
+        self.paused = paused
+        self._call_in_loop(self._apply_state)
+
+    def _call_in_loop(self, callback):
+        loop = self.loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(callback)
+            except RuntimeError:
+                pass  # Loop closed between the check and the call
+
+    def _apply_state(self):
+        if self.stop_requested:
+            self.stop_event.set()
+            self.resume_event.set()  # Wake paused workers so they can exit
+        elif self.paused:
+            self.resume_event.clear()
+        else:
+            self.resume_event.set()
+
+    async def _run(self, tasks, url_fn, scrape_fn, on_result):
+        self.loop = asyncio.get_running_loop()
+        self.stop_event = asyncio.Event()
+        self.resume_event = asyncio.Event()
+        self._apply_state()
+
+        task_queue = asyncio.Queue()
+        for index, task in enumerate(tasks):
+            task_queue.put_nowait((index, task))
+        merger = OrderedResultMerger(tasks, on_result)
+        executor = ThreadPoolExecutor(max_workers=len(self.drivers), thread_name_prefix='scrape')
+
+        async def worker(driver):
+            while not self.stop_event.is_set():
+                await self.resume_event.wait()
+                if self.stop_event.is_set() or task_queue.empty():
+                    break
+                index, task = task_queue.get_nowait()
+                await self.rate_limiter.acquire(url_fn(task))
+                if self.stop_event.is_set():
+                    break
+                rows = None
+                try:
+                    rows = await self.loop.run_in_executor(executor, scrape_fn, driver, task)
+                except Exception as e:
+                    log_error(f"Worker failed on task {task}: {e}", self.log_text)
+                merger.add(index, rows)
+
+        workers = [asyncio.create_task(worker(driver)) for driver in self.drivers]
+        all_workers = asyncio.gather(*workers, return_exceptions=True)
+        stop_waiter = asyncio.create_task(self.stop_event.wait())
+        try:
+            await asyncio.wait([stop_waiter, all_workers], return_when=asyncio.FIRST_COMPLETED)
+            if self.stop_event.is_set():
+                log_debug("Stop requested; cancelling async workers.", self.log_text)
+                for task in workers:
+                    task.cancel()
+            await all_workers
+        finally:
+            stop_waiter.cancel()
+            executor.shutdown(wait=True)
+            self.loop = None
+
+        merger.drain()
+        log_message("Async scraping engine finished.", self.log_text, level="info")
@@ -0,0 +1,107 @@
+# batch_runner.py
+
+import os
+import re
+import threading
+from selenium.common.exceptions import WebDriverException
+from driver_pool import DriverPool
+from logging_setup import log_message, log_error
+
+def query_csv_filename(csv_filename, query):
+    """Returns the per-query output file, e.g. 'search_results.csv' -> 'search_results_rtx-4080.csv'."""
+    root, extension = os.path.splitext(csv_filename or 'scraped_data.csv')
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', query).strip('-') or 'query'
+    return f"{root}_{slug}{extension or '.csv'}"
+
+class BatchRunner:
+    """
+    Scrapes several queries across one shared pool of drivers.
+
+    Each query gets its own ScraperManager run (checkpoint, end-of-results detection, CSV file),
+    while their pages are interleaved in a single task list, so every driver stays busy until the
+    last page of the last query and wall time follows the total page count.
+    """
+    def __init__(self, manager, queries):
+        self.manager = manager
+        self.queries = queries
+        self.runs = []
+        self.lock = threading.Lock()
+
+    def run(self, resume=False):
+        """Scrapes every query and writes one CSV per query."""
+        manager = self.manager
+        manager.stop_event.clear()
+        manager.pause_event.set()
+        self.runs = []
+        pool = None
+        try:
+            manager.prepare_resilience()  # One circuit breaker for the whole batch, shared by its query runs
+            for query in self.queries:
+                run = manager.create_query_run(query, query_csv_filename(manager.config.get('csv_filename_var', ''), query))
+                self.runs.append(run)  # Listed before preparing, so a run that fails halfway is still closed
+                run.prepare_run(resume)
+
+            worker_count = manager.config_int('worker_count_var', 2)
+            use_http = all(run.http_fetcher for run in self.runs)
+            pool = DriverPool(worker_count, manager.launch_driver, manager.close_driver, manager.log_text,
+                              launch_drivers=not use_http)
+            if not pool.start():
+                manager.last_error = WebDriverException("Failed to initialize any WebDriver for the batch.")
+                log_error(str(manager.last_error), manager.log_text)
+                return
+
+            if not use_http:
+                manager.prepare_user_agent_rotation(pool.worker_count)
+            manager.update_status_bar(f"Starting batch of {len(self.runs)} queries with {pool.worker_count} workers...")
+            pool.run(self.tasks(), self.scrape_task, self.record_task, manager.stop_event, manager.handle_pause,
+                     rotate_driver=manager.agent_rotator and manager.agent_rotator.driver_for_page)
+
+            if manager.stop_event.is_set():
+                log_message("Batch stopped by user", manager.log_text, level="warning")
+            for run in self.runs:
+                run.finish_scraping(notify=False)
+            manager.show_completion_message()
+            manager.update_status_bar(f"Batch completed: {len(self.runs)} queries, {self.pages_done()} pages.")
+
+        except Exception as e:
+            manager.last_error = e
+            log_error(f"Unexpected error during batch scraping: {e}", manager.log_text)
+            manager.update_status_bar(f"Error during batch scraping: {e}")
+        finally:
+            if pool is not None:
+                pool.close(manager.agent_rotator and manager.agent_rotator.agent_for)
+            for run in self.runs:
+                run.close_run_resources()
+            manager.close_run_resources()  # Fallback drivers are shared through the parent manager
+
+    def tasks(self):
+        """Returns (query index, page number) tasks, round-robin across queries so each query's first page runs early."""
+        pages = [list(range(run.first_page, run.last_page + 1)) for run in self.runs]
+        tasks = []
+        for depth in range(max((len(query_pages) for query_pages in pages), default=0)):
+            tasks.extend((index, query_pages[depth]) for index, query_pages in enumerate(pages) if depth < len(query_pages))
+        return tasks
+
+    def scrape_task(self, driver, task):
+        query_index, page_number = task
+        return self.runs[query_index].scrape_page(driver, page_number)
+
+    def record_task(self, task, rows):
+        query_index, page_number = task
+        run = self.runs[query_index]
+        run.record_page(page_number, rows, run.config_int('max_pages_var', 1))
+        self.report_progress()
+
+    def pages_done(self):
+        return sum(run.pages_completed for run in self.runs)
+
+    def report_progress(self):
+        """Shows the combined progress of all queries in the main progress bar and status bar."""
+        with self.lock:
+            total_pages = sum(min(run.config_int('max_pages_var', 1), run.last_page) for run in self.runs)
+            pages_done = self.pages_done()
+            queries_done = sum(1 for run in self.runs
+                               if run.pages_completed >= min(run.config_int('max_pages_var', 1), run.last_page))
+        self.manager.update_progress(pages_done / max(1, total_pages) * 100)
+        self.manager.update_status_bar(f"Batch: {pages_done}/{total_pages} pages, "
+                                       f"{queries_done}/{len(self.runs)} queries complete")
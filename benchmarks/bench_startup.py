@@ -0,0 +1,117 @@
+# bench_startup.py
+
+"""
+Startup benchmark: import time of the scraper modules, time until the CLI prints its first line,
+and (when a display is available) time until the GUI window is first painted.
+
+Every measurement runs in a fresh interpreter from a scratch directory holding copies of
+config.json and field_values.json, so logs, checkpoints and CSVs never touch the checkout.
+
+Usage: python benchmarks/bench_startup.py [--runs N]
+Exits with status 1 if any median exceeds its budget.
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Startup budgets in seconds (median of the runs)
+BUDGETS = {
+    'import scraper_manager': 0.25,
+    'CLI first output': 0.6,
+    'GUI first paint': 1.0,
+}
+
+IMPORT_SCRIPT = """
+import sys, time
+started = time.perf_counter()
+sys.path.insert(0, {repo!r})
+import scraper_manager
+print(time.perf_counter() - started)
+print('selenium.webdriver' in sys.modules)
+"""
+
+GUI_SCRIPT = """
+import sys, time
+started = time.perf_counter()
+sys.path.insert(0, {repo!r})
+import tkinter
+
+def first_paint(root):
+    root.update()  # Process the initial expose/draw events
+    print(time.perf_counter() - started)
+    root.destroy()
+
+tkinter.Tk.mainloop = first_paint
+import main
+main.main()
+"""
+
+def run_python(code, cwd):
+    """Runs a snippet in a fresh interpreter and returns its stdout lines."""
+    result = subprocess.run([sys.executable, '-c', code], cwd=cwd, capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+def time_cli_first_output(cwd):
+    """Seconds from launching cli.py until its first line on stdout (a zero-page HTTP run needs no browser)."""
+    command = [
+        sys.executable, os.path.join(REPO_DIR, 'cli.py'),
+        '--config', os.path.join(cwd, 'config.json'),
+        '--max-pages', '0', '--output', os.path.join(cwd, 'bench.csv'),
+        '--set', 'fetch_mode_var="http"'
+    ]
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    process.stdout.readline()
+    elapsed = time.perf_counter() - started
+    process.stdout.read()
+    process.wait()
+    return elapsed
+
+def report(name, samples):
+    """Prints the median against its budget and returns whether it is within budget."""
+    median = statistics.median(samples)
+    budget = BUDGETS[name]
+    status = "ok" if median <= budget else "OVER BUDGET"
+    print(f"{name:<24} median {median * 1000:7.1f} ms  (min {min(samples) * 1000:.1f} ms, "
+          f"budget {budget * 1000:.0f} ms)  {status}")
+    return median <= budget
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help="Runs per measurement (default: %(default)s)")
+    args = parser.parse_args()
+
+    within_budget = True
+    with tempfile.TemporaryDirectory() as scratch:
+        for name in ('config.json', 'field_values.json'):
+            shutil.copy(os.path.join(REPO_DIR, name), scratch)
+
+        samples = []
+        for _ in range(args.runs):
+            elapsed, selenium_loaded = run_python(IMPORT_SCRIPT.format(repo=REPO_DIR), scratch)
+            samples.append(float(elapsed))
+        within_budget &= report('import scraper_manager', samples)
+        if selenium_loaded == 'True':
+            print("  selenium.webdriver was imported at startup; it should load with the first driver")
+            within_budget = False
+
+        within_budget &= report('CLI first output', [time_cli_first_output(scratch) for _ in range(args.runs)])
+
+        if os.environ.get('DISPLAY') or sys.platform in ('win32', 'darwin'):
+            samples = [float(run_python(GUI_SCRIPT.format(repo=REPO_DIR), scratch)[-1]) for _ in range(args.runs)]
+            within_budget &= report('GUI first paint', samples)
+        else:
+            print("GUI first paint          skipped (no display)")
+
+    return 0 if within_budget else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
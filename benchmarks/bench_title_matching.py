@@ -0,0 +1,107 @@
+# bench_title_matching.py
+
+"""
+Title matching benchmark: time to index a catalogue of known product titles and to match a batch
+of reworded titles against it with title_matcher.TitleMatcher.
+
+The catalogue is synthetic but shaped like scraped listings: a few common words ("nvidia",
+"graphics card", "gb") shared by many titles and a model number shared by few. Each query is a
+known title with its words reordered, its spacing and punctuation changed, or a word without digits
+dropped, so the benchmark also reports how many queries found the title they came from.
+
+Usage: python benchmarks/bench_title_matching.py [--known N] [--queries N] [--seed N]
+Exits with status 1 if matching exceeds its budget or recall drops below the minimum.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from title_matcher import TitleMatcher
+
+# Budgets in seconds, for the default 1,000,000 known and 10,000 new titles
+BUDGETS = {
+    'index known titles': 60.0,
+    'match new titles': 10.0,
+}
+MIN_RECALL = 0.95
+
+BRANDS = ['ASUS', 'MSI', 'Gigabyte', 'Zotac', 'Palit', 'EVGA', 'Sapphire', 'PowerColor', 'XFX', 'PNY',
+          'Inno3D', 'Gainward', 'KFA2', 'ASRock', 'Biostar', 'Colorful', 'Galax', 'Manli', 'Yeston', 'Maxsun']
+CHIPS = ['GeForce RTX 4060', 'GeForce RTX 4060 Ti', 'GeForce RTX 4070', 'GeForce RTX 4070 Super',
+         'GeForce RTX 4080', 'GeForce RTX 4090', 'GeForce RTX 3060', 'GeForce GTX 1650',
+         'Radeon RX 7600', 'Radeon RX 7700 XT', 'Radeon RX 7800 XT', 'Radeon RX 7900 XTX']
+LINES = ['Dual', 'Ventus', 'Gaming', 'Eagle', 'Aero', 'Twin Edge', 'StormX', 'Phantom', 'Pulse', 'Nitro',
+         'Hellhound', 'Fighter', 'Challenger', 'Windforce', 'TUF', 'ROG Strix', 'Prime', 'Mercury']
+EDITIONS = ['OC', 'OC Edition', 'White', 'Black', 'Limited', 'LP', '2X', '3X', 'Pro', 'Plus']
+MEMORY = ['6GB', '8GB', '10GB', '12GB', '16GB', '20GB', '24GB']
+SUFFIXES = ['Graphics Card', 'Video Card', 'GDDR6', 'GDDR6X', 'PCIe 4.0', 'HDMI DisplayPort']
+
+def known_titles(count, rng):
+    """Generates catalogue titles; every model number is shared by a few variants of a card."""
+    titles = []
+    for index in range(count):
+        model = f"V{index // 4:06d}"
+        words = [rng.choice(BRANDS), rng.choice(CHIPS), rng.choice(LINES), rng.choice(EDITIONS),
+                 rng.choice(MEMORY), rng.choice(SUFFIXES), model]
+        titles.append(' '.join(words))
+    return titles
+
+def reworded(title, rng):
+    """Returns the title as another site might list it."""
+    words = title.split()
+    change = rng.randrange(4)
+    if change == 0:
+        rng.shuffle(words)
+    elif change == 1:
+        words = [word.lower().replace('GB', ' GB') for word in words]
+    elif change == 2:
+        words.insert(rng.randrange(len(words)), rng.choice(['-', '|', ',', '/']))
+    else:
+        # Drop a word without digits: a title missing "4070" or "12GB" may be another product
+        droppable = [index for index, word in enumerate(words) if not any(c.isdigit() for c in word)]
+        del words[rng.choice(droppable)]
+    return ' '.join(words)
+
+def report(name, elapsed):
+    """Prints the time against its budget and returns whether it is within budget."""
+    budget = BUDGETS[name]
+    status = "ok" if elapsed <= budget else "OVER BUDGET"
+    print(f"{name:<20} {elapsed:8.2f} s  (budget {budget:.0f} s)  {status}")
+    return elapsed <= budget
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--known', type=int, default=1_000_000, help="Known titles (default: %(default)s)")
+    parser.add_argument('--queries', type=int, default=10_000, help="New titles to match (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=1, help="Random seed (default: %(default)s)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    titles = known_titles(args.known, rng)
+    picks = [rng.randrange(len(titles)) for _ in range(args.queries)]
+    queries = [reworded(titles[pick], rng) for pick in picks]
+
+    matcher = TitleMatcher()
+    started = time.perf_counter()
+    for title in titles:
+        matcher.add(title)
+    within_budget = report('index known titles', time.perf_counter() - started)
+
+    started = time.perf_counter()
+    matches = [matcher.match(query) for query in queries]
+    within_budget &= report('match new titles', time.perf_counter() - started)
+
+    found = sum(1 for pick, match in zip(picks, matches) if match and matcher.titles[match[0]] == titles[pick])
+    recall = found / len(queries) if queries else 1.0
+    status = "ok" if recall >= MIN_RECALL else "BELOW MINIMUM"
+    print(f"{'recall':<20} {recall:8.2%}    (minimum {MIN_RECALL:.0%})  {status}")
+    return 0 if within_budget and recall >= MIN_RECALL else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
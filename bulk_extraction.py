@@ -0,0 +1,76 @@
+# bulk_extraction.py
+
+# Finds a container's secondary offer price: the first secondary-price element next to (or around)
+# the text that contains the indicator, e.g. "More buying choices". Without an indicator, the first
+# secondary-price element in the container is used.
+SECONDARY_PRICE_FUNCTION = """
+const secondaryPriceOf = (container, indicator, selector) => {
+    if (!selector) return null;
+    if (!indicator) {
+        const element = container.querySelector(selector);
+        return element ? element.innerText.trim() : null;
+    }
+    const needle = indicator.toLowerCase();
+    const walker = document.createTreeWalker(container, NodeFilter.SHOW_TEXT);
+    for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+        if (!node.nodeValue.toLowerCase().includes(needle)) continue;
+        for (let element = node.parentElement; element && container.contains(element); element = element.parentElement) {
+            const match = element.querySelector(selector);
+            if (match) return match.innerText.trim();
+        }
+    }
+    return null;
+};
+"""
+
+# Collects every container's title, price and secondary price text in one execute_script call.
+# innerText matches what WebElement.text returns for rendered elements.
+EXTRACTION_SCRIPT = SECONDARY_PRICE_FUNCTION + """
+const [containerSelector, titleSelector, priceSelector, secondaryIndicator, secondarySelector] = arguments;
+const textOf = (root, selector) => {
+    const element = root.querySelector(selector);
+    return element ? element.innerText.trim() : null;
+};
+return Array.from(document.querySelectorAll(containerSelector),
+                  container => [textOf(container, titleSelector), textOf(container, priceSelector),
+                                secondaryPriceOf(container, secondaryIndicator, secondarySelector)]);
+"""
+
+# Secondary price text of every container, for pages whose titles and prices are read element by element.
+SECONDARY_PRICES_SCRIPT = SECONDARY_PRICE_FUNCTION + """
+const [containerSelector, secondaryIndicator, secondarySelector] = arguments;
+return Array.from(document.querySelectorAll(containerSelector),
+                  container => secondaryPriceOf(container, secondaryIndicator, secondarySelector));
+"""
+
+def extract_page(driver, container_selector, title_selector, price_selector,
+                 secondary_indicator='', secondary_selector=''):
+    """
+    Extracts all containers on the current page in a single WebDriver round trip.
+
+    Parameters:
+    - driver (webdriver.Firefox): Driver with the page loaded.
+    - container_selector (str): CSS selector for product containers.
+    - title_selector (str): CSS selector for the title inside a container.
+    - price_selector (str): CSS selector for the price inside a container.
+    - secondary_indicator (str, optional): Text that marks the secondary offer, e.g. "More buying choices".
+    - secondary_selector (str, optional): CSS selector for the secondary price; empty to skip it.
+
+    Returns:
+    - list: One (title_text, price_text, secondary_price_text) tuple per container; any may be None when missing.
+    """
+    rows = driver.execute_script(EXTRACTION_SCRIPT, container_selector, title_selector, price_selector,
+                                 secondary_indicator, secondary_selector)
+    return [(title, price_text, secondary_text) for title, price_text, secondary_text in rows or []]
+
+def extract_secondary_prices(driver, container_selector, secondary_indicator, secondary_selector):
+    """
+    Reads the secondary price text of every container on the current page in one round trip.
+
+    Returns:
+    - list: One secondary price text (or None) per container, in document order.
+    """
+    if not secondary_selector:
+        return []
+    return list(driver.execute_script(SECONDARY_PRICES_SCRIPT, container_selector,
+                                      secondary_indicator, secondary_selector) or [])
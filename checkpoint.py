@@ -0,0 +1,113 @@
+# checkpoint.py
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from logging_setup import log_message, log_debug, log_error
+
+CHECKPOINT_DIR = 'checkpoints'
+
+# Settings that decide which pages a run visits and what it extracts. The container selector is
+# left out because selector probing may replace it between runs of the same query.
+SIGNATURE_KEYS = (
+    'entry_var', 'url_entry_var', 'url_path_var', 'url_append_params_var', 'page_param_var',
+    'price_var', 'title_selector_var', 'price_selectors_var', 'secondary_price_indicator_var',
+    'secondary_price_selectors_var'
+)
+
+def run_signature(config):
+    """Returns a stable hash of the query and configuration that identify a run."""
+    values = {key: config.get(key, '') for key in SIGNATURE_KEYS}
+    return hashlib.sha256(json.dumps(values, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+class Checkpoint:
+    """
+    Append-only, page-granular record of a run, so an interrupted run can resume.
+
+    Every completed page is written as one JSON line holding its page number and rows, and
+    fsynced before the run moves on. A line torn by a crash is ignored when loading.
+    """
+    def __init__(self, signature, directory=CHECKPOINT_DIR, log_text=None):
+        self.signature = signature
+        self.path = os.path.join(directory, f"{signature[:16]}.jsonl")
+        self.log_text = log_text
+        self.file = None
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self):
+        """
+        Reads the pages recorded by an earlier run with the same signature.
+
+        Returns:
+        - dict: page number -> list of row tuples.
+        """
+        pages = {}
+        if not os.path.exists(self.path):
+            return pages
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    log_debug(f"Ignoring incomplete checkpoint line in {self.path}", self.log_text)
+                    continue
+                if 'page' in entry:
+                    pages[entry['page']] = [tuple(row) for row in entry['rows']]
+        return pages
+
+    def resume_point(self):
+        """Returns (first incomplete page, rows of the pages before it) from the recorded pages."""
+        pages = self.load()
+        first_page = 1
+        rows = []
+        while first_page in pages:
+            rows.extend(pages[first_page])
+            first_page += 1
+        return first_page, rows
+
+    def open(self, resume=False):
+        """Opens the checkpoint for appending; a fresh run discards any previous record."""
+        self.close()
+        if resume and os.path.exists(self.path):
+            self.file = open(self.path, 'a+', encoding='utf-8')
+            self.file.seek(0, os.SEEK_END)
+            if self.file.tell():
+                self.file.seek(self.file.tell() - 1)
+                if self.file.read(1) != '\n':
+                    self._write_line('')  # Terminate a line torn by a crash so the next entry parses
+            return
+        self.file = open(self.path, 'w', encoding='utf-8')
+        self._write({'signature': self.signature, 'started': datetime.now().isoformat(timespec='seconds')})
+
+    def record_page(self, page_number, rows):
+        """Durably appends one completed page."""
+        if self.file is None:
+            return
+        try:
+            self._write({'page': page_number, 'rows': [list(row) for row in rows]})
+        except OSError as e:
+            log_error(f"Could not write checkpoint for page {page_number}: {e}", self.log_text)
+
+    def complete(self):
+        """Removes the checkpoint once the run has finished every page."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            return
+        log_message("Run complete; checkpoint removed.", self.log_text, level="info")
+
+    def close(self):
+        """Closes the checkpoint file, keeping it on disk for a later resume."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def _write(self, entry):
+        self._write_line(json.dumps(entry))
+
+    def _write_line(self, line):
+        self.file.write(line + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
@@ -0,0 +1,85 @@
+# cli.py
+
+import argparse
+import json
+import signal
+import sys
+from config_manager import CONFIG_FILE, load_config_file
+from progress_reporter import ConsoleProgressReporter
+from scraper_manager import ScraperManager
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(
+        description="Run the product scraper without a GUI. Progress goes to stdout, logs to stderr and scraping.log."
+    )
+    parser.add_argument('--config', default=CONFIG_FILE, help="Configuration file (default: %(default)s)")
+    parser.add_argument('--query', help="Search query; overrides entry_var")
+    parser.add_argument('--max-pages', type=int, help="Maximum pages to scrape; overrides max_pages_var")
+    parser.add_argument('--output', help="CSV file for the results; overrides csv_filename_var")
+    parser.add_argument('--set', action='append', default=[], metavar='KEY=VALUE',
+                        help="Override any config key, e.g. --set scrape_mode_var=pool (values are parsed as JSON when possible)")
+    parser.add_argument('--batch', action='store_true', help="Scrape every query in batch_queries_var")
+    parser.add_argument('--resume', action='store_true', help="Resume the last interrupted run of the same query")
+    parser.add_argument('--print-results', action='store_true', help="Also print each extracted row to stdout")
+    return parser.parse_args(argv)
+
+def parse_override(option):
+    """Split a KEY=VALUE option, decoding JSON values such as true, 4 or ["a", "b"]."""
+    key, separator, value = option.partition('=')
+    if not separator or not key:
+        raise ValueError(f"Expected KEY=VALUE, got '{option}'")
+    try:
+        return key, json.loads(value)
+    except json.JSONDecodeError:
+        return key, value
+
+def build_config(args):
+    """Load the config file and apply command-line overrides."""
+    config = load_config_file(config_file=args.config)
+    for option in args.set:
+        key, value = parse_override(option)
+        config[key] = value
+    if args.query is not None:
+        config['entry_var'] = args.query
+    if args.max_pages is not None:
+        config['max_pages_var'] = str(args.max_pages)
+    if args.output is not None:
+        config['csv_filename_var'] = args.output
+    return config
+
+def main(argv=None):
+    """
+    Run one scrape (or a batch) headlessly.
+
+    Returns:
+    - int: 0 on success, 1 if the run failed, 130 if it was interrupted with Ctrl+C.
+    """
+    args = parse_args(argv)
+    try:
+        config = build_config(args)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    manager = ScraperManager(config, reporter=ConsoleProgressReporter(print_results=args.print_results))
+
+    def interrupt(signum, frame):
+        # First Ctrl+C stops gracefully (results so far are saved and checkpointed); a second one aborts
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        manager.stop_scraping()
+
+    signal.signal(signal.SIGINT, interrupt)
+    if args.batch:
+        manager.start_batch_scraping(resume=args.resume)
+    else:
+        manager.start_scraping(resume=args.resume)
+
+    if manager.last_error is not None:
+        return 1
+    if manager.stop_event.is_set():
+        return 130
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
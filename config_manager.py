@@ -1,27 +1,36 @@
 # config_manager.py
 
+import ast
+import copy
 import json
 import os
-import tkinter as tk  # Import tkinter for BooleanVar and StringVar support
 from logging_setup import log_message, log_debug, log_error
 
 CONFIG_FILE = 'config.json'
 FIELD_VALUES_FILE = 'field_values.json'
 BACKUP_CONFIG_FILE = 'config_backup.json'
 
-def load_config_file(log_text=None):
-    """Load configuration settings from 'config.json'."""
-    if not os.path.exists(CONFIG_FILE):
-        log_message(f"{CONFIG_FILE} not found. Using default configuration.", log_text, level="warning")
+# Parsed config files, keyed by path and invalidated when the file's size or modification time changes
+_config_cache = {}
+
+def load_config_file(log_text=None, config_file=CONFIG_FILE):
+    """Load configuration settings from 'config.json' (or another config file)."""
+    if not os.path.exists(config_file):
+        log_message(f"{config_file} not found. Using default configuration.", log_text, level="warning")
         return {}
 
     try:
-        with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+        stat = os.stat(config_file)
+        cached = _config_cache.get(config_file)
+        if cached and cached[0] == (stat.st_mtime_ns, stat.st_size):
+            return copy.deepcopy(cached[1])
+        with open(config_file, 'r', encoding='utf-8') as f:
             config_data = json.load(f)
-        log_message(f"Loaded configuration from '{CONFIG_FILE}'.", log_text, level="info")
-        return config_data
+        _config_cache[config_file] = ((stat.st_mtime_ns, stat.st_size), config_data)
+        log_message(f"Loaded configuration from '{config_file}'.", log_text, level="info")
+        return copy.deepcopy(config_data)
     except json.JSONDecodeError as e:
-        log_error(f"JSON format error in '{CONFIG_FILE}': {e}", log_text)
+        log_error(f"JSON format error in '{config_file}': {e}", log_text)
     except Exception as e:
         log_error(f"Unexpected error loading configuration: {e}", log_text)
     return {}
@@ -29,6 +38,7 @@ def load_config_file(log_text=None):
 def save_config_file(config_data, log_text=None):
     """Save configuration settings to 'config.json'."""
     create_backup(CONFIG_FILE, BACKUP_CONFIG_FILE, log_text)
+    _config_cache.pop(CONFIG_FILE, None)
     
     try:
         with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
@@ -44,19 +54,23 @@ def save_config_file(config_data, log_text=None):
 def load_field_values(field_vars, log_text=None):
     """Load field values into the GUI from configuration file."""
     config_data = load_config_file(log_text)
+    missing_keys = []
     for key, var in field_vars.items():
         if key in config_data:
             value = config_data[key]
             if hasattr(var, "set"):
-                if isinstance(var, tk.BooleanVar):
+                if isinstance(var.get(), bool):  # BooleanVar; checked by value so this module needs no tkinter
                     var.set(bool(value))
                 else:
                     var.set(value)
-                log_debug(f"Set '{key}' to '{value}'", log_text)
             else:
                 log_error(f"Cannot set '{key}'; not a Tkinter Variable", log_text)
         else:
-            log_message(f"Config key '{key}' not found. Using default.", log_text, level="warning")
+            missing_keys.append(key)
+    log_debug(f"Set {len(field_vars) - len(missing_keys)} fields from the configuration.", log_text)
+    if missing_keys:
+        log_message(f"{len(missing_keys)} config keys not found, using defaults: {', '.join(missing_keys)}",
+                    log_text, level="warning")
 
 def save_field_values(field_vars, log_text=None):
     """Save current field values from the GUI to the configuration file."""
@@ -95,6 +109,25 @@ def save_previous_values(previous_values, log_text=None):
     except Exception as e:
         log_error(f"Unexpected error saving previous values: {e}", log_text)
 
+def split_config_list(value):
+    """
+    Normalize a list-valued setting to a list of strings.
+
+    Accepts a list, a list/tuple literal (what a Tk StringVar returns for a list loaded from
+    'config.json'), or a comma-separated string typed into an entry.
+    """
+    if isinstance(value, (list, tuple)):
+        return [str(item).strip() for item in value if str(item).strip()]
+    value = (value or '').strip()
+    if value.startswith(('[', '(')):
+        try:
+            parsed = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            parsed = None
+        if isinstance(parsed, (list, tuple)):
+            return split_config_list(parsed)
+    return [item.strip() for item in value.split(',') if item.strip()]
+
 def create_backup(original_file, backup_file, log_text=None):
     """Create a backup of the configuration file before overwriting it."""
     try:
@@ -0,0 +1,161 @@
+# dedup.py
+
+import math
+import os
+import struct
+import threading
+from hashlib import blake2b
+from urllib.parse import urlsplit
+from title_matcher import normalize_title
+from logging_setup import log_message, log_debug
+
+DEDUP_MODES = ('off', 'run', 'persistent')
+FILTER_FILE = 'seen_products.bloom'
+
+HEADER = struct.Struct('<8sQIQQ')  # magic, bit count, hash count, capacity, titles added
+MAGIC = b'SCRBLOOM'
+
+def fingerprint(title, site=''):
+    """
+    Returns a 16-byte fingerprint of a product title on a site.
+
+    Titles are normalized first, so "RTX-4070 12GB" and "rtx 4070 12 gb" on the same site share a
+    fingerprint, while the same title on two sites does not.
+    """
+    key = f"{site_key(site)}\0{normalize_title(title)}"
+    return blake2b(key.encode('utf-8'), digest_size=16).digest()
+
+def site_key(url):
+    """Reduces a base URL such as "https://www.example.com/s" to its host, "www.example.com"."""
+    return (urlsplit(url).hostname or url) if '//' in url else url
+
+class BloomFilter:
+    """
+    A fixed-size set of fingerprints stored in a file.
+
+    Its size depends only on `capacity` and `error_rate`, never on how many fingerprints have
+    been added: about 1.8 MB for a million titles at a 0.1% false-positive rate. A false positive
+    makes a new product look seen; a seen product is never reported as new. Past `capacity` the
+    false-positive rate climbs, and save() logs a warning.
+    """
+    save_lock = threading.Lock()  # Batch runs in one process may save the same file
+
+    def __init__(self, path=FILTER_FILE, capacity=1_000_000, error_rate=0.001, log_text=None):
+        self.path = path
+        self.capacity = max(1, int(capacity))
+        self.log_text = log_text
+        self.added = 0  # Fingerprints added since the file was loaded
+        self.stored = 0
+        if os.path.exists(path):
+            self.size, self.hashes, self.capacity, self.stored, self.bits = self._read(path)
+            log_debug(f"Loaded {path}: about {self.stored} products seen.", log_text)
+        else:
+            self.size = max(8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+            self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+            self.bits = bytearray((self.size + 7) // 8)
+
+    def __contains__(self, digest):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+    def add(self, digest):
+        """Adds a fingerprint; returns False if it was (probably) already present."""
+        new = False
+        for position in self._positions(digest):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not self.bits[byte] & mask:
+                self.bits[byte] |= mask
+                new = True
+        self.added += new
+        return new
+
+    def save(self):
+        """
+        Writes the filter back to its file in one atomic replace.
+
+        Bits already in the file, e.g. saved by another batch query meanwhile, are merged in first.
+        """
+        with self.save_lock:
+            bits, stored = self.bits, self.stored
+            if os.path.exists(self.path):
+                try:
+                    size, hashes, _, stored, on_disk = self._read(self.path)
+                except ValueError:
+                    size = hashes = None  # A damaged file is replaced rather than merged
+                    stored = self.stored
+                if (size, hashes) == (self.size, self.hashes):
+                    merged = int.from_bytes(self.bits, 'little') | int.from_bytes(on_disk, 'little')
+                    bits = bytearray(merged.to_bytes(len(self.bits), 'little'))
+            count = stored + self.added
+            part_filename = self.path + '.part'
+            with open(part_filename, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, self.size, self.hashes, self.capacity, count))
+                f.write(bits)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(part_filename, self.path)
+            self.bits, self.stored, self.added = bits, count, 0
+
+        if count > self.capacity:
+            log_message(f"{self.path} holds about {count} products, more than its capacity of {self.capacity}; "
+                        f"delete it or raise the capacity to keep new products from being mistaken for seen ones.",
+                        self.log_text, level="warning")
+
+    def _positions(self, digest):
+        # Double hashing: the two halves of the fingerprint generate every bit position
+        first = int.from_bytes(digest[:8], 'little')
+        step = int.from_bytes(digest[8:16], 'little') | 1
+        return [(first + i * step) % self.size for i in range(self.hashes)]
+
+    @staticmethod
+    def _read(path):
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError(f"{path} is truncated")
+            magic, size, hashes, capacity, stored = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a seen-products filter")
+            bits = bytearray(f.read())
+        if len(bits) != (size + 7) // 8 or not hashes:
+            raise ValueError(f"{path} is truncated")
+        return size, hashes, capacity, stored, bits
+
+class Deduplicator:
+    """
+    Drops rows whose product was already seen, by fingerprint of normalized title and site.
+
+    In 'run' mode the fingerprints seen in this run are kept in memory. In 'persistent' mode they go
+    into a BloomFilter saved across runs, so memory stays at the filter's fixed size however many
+    products have been seen, and a later run writes only products no earlier run has written.
+    """
+    def __init__(self, site, bloom_filter=None, seen_rows=(), log_text=None):
+        self.site = site_key(site)
+        self.bloom_filter = bloom_filter
+        self.log_text = log_text
+        self.seen = set()
+        self.duplicates = 0
+        self.lock = threading.Lock()
+        for row in seen_rows:  # e.g. rows restored from a checkpoint, in case the filter was never saved
+            self._add(fingerprint(row[0], self.site))
+
+    def filter_rows(self, rows):
+        """Returns the rows whose product has not been seen, marking them seen."""
+        with self.lock:
+            new_rows = [row for row in rows if self._add(fingerprint(row[0], self.site))]
+            self.duplicates += len(rows) - len(new_rows)
+        return new_rows
+
+    def close(self):
+        """Saves the persistent filter and logs how many rows were dropped."""
+        if self.bloom_filter is not None:
+            self.bloom_filter.save()
+        if self.duplicates:
+            log_message(f"Skipped {self.duplicates} duplicate products.", self.log_text, level="info")
+
+    def _add(self, digest):
+        if self.bloom_filter is not None:
+            return self.bloom_filter.add(digest)
+        if digest in self.seen:
+            return False
+        self.seen.add(digest)
+        return True
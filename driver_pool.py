@@ -0,0 +1,142 @@
+# driver_pool.py
+
+import queue
+import threading
+from logging_setup import log_message, log_debug, log_error
+
+class DriverPool:
+    """
+    A fixed set of WebDriver instances, one per worker thread.
+
+    Workers pull tasks (page numbers) from a shared queue and hand their results
+    back in task order, so callers see the same ordering as a sequential run.
+    """
+    def __init__(self, worker_count, driver_factory, close_driver, log_text=None, launch_drivers=True):
+        self.worker_count = max(1, int(worker_count))
+        self.driver_factory = driver_factory  # Returns a new WebDriver or None
+        self.close_driver = close_driver  # Quits a driver or keeps it warm for reuse
+        self.log_text = log_text
+        self.launch_drivers = launch_drivers  # False: workers get None and obtain a driver on demand
+        self.drivers = []
+
+    def start(self):
+        """
+        Launches one WebDriver per worker concurrently.
+
+        Returns:
+        - int: Number of drivers that started successfully, or the worker count if drivers launch on demand.
+        """
+        if not self.launch_drivers:
+            log_message(f"Worker pool started with {self.worker_count} workers; drivers launch on demand.", self.log_text, level="info")
+            return self.worker_count
+
+        lock = threading.Lock()
+
+        def launch():
+            driver = self.driver_factory()
+            if driver:
+                with lock:
+                    self.drivers.append(driver)
+
+        threads = [threading.Thread(target=launch, daemon=True) for _ in range(self.worker_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        log_message(f"Driver pool started with {len(self.drivers)}/{self.worker_count} drivers.", self.log_text, level="info")
+        return len(self.drivers)
+
+    def run(self, tasks, scrape_fn, on_result, stop_event, wait_if_paused, rotate_driver=None):
+        """
+        Processes tasks across all drivers and reports results in task order.
+
+        Parameters:
+        - tasks (list): Ordered tasks, e.g. page numbers.
+        - scrape_fn (callable): scrape_fn(driver, task) -> list of rows; driver is None when drivers launch on demand.
+        - on_result (callable): on_result(task, rows), called once per task in task order;
+          rows is None if the task failed or was never run.
+        - stop_event (threading.Event): Set to stop all workers.
+        - wait_if_paused (callable): Blocks while scraping is paused.
+        - rotate_driver (callable, optional): rotate_driver(driver) -> driver, called before each task;
+          a returned replacement takes the old driver's place in the pool.
+        """
+        task_queue = queue.Queue()
+        for index, task in enumerate(tasks):
+            task_queue.put((index, task))
+
+        merger = OrderedResultMerger(tasks, on_result)
+
+        def worker(slot, driver):
+            while not stop_event.is_set():
+                wait_if_paused()
+                if stop_event.is_set():
+                    break
+                try:
+                    index, task = task_queue.get_nowait()
+                except queue.Empty:
+                    break
+                rows = None
+                try:
+                    if rotate_driver and driver is not None:
+                        driver = rotate_driver(driver)
+                        self.drivers[slot] = driver
+                    rows = scrape_fn(driver, task)
+                except Exception as e:
+                    log_error(f"Worker failed on task {task}: {e}", self.log_text)
+                merger.add(index, rows)
+
+        threads = [threading.Thread(target=worker, args=(slot, driver), daemon=True)
+                   for slot, driver in enumerate(self.workers())]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        merger.drain()
+
+    def workers(self):
+        """Returns one driver handle per worker; None for each worker when drivers launch on demand."""
+        return self.drivers if self.launch_drivers else [None] * self.worker_count
+
+    def close(self, agent_for=None):
+        """
+        Hands every driver in the pool to close_driver.
+
+        agent_for(driver), if given, returns the user agent a driver runs with (e.g. after rotation)
+        so that close_driver keeps it warm under the right one.
+        """
+        for driver in self.drivers:
+            try:
+                if agent_for:
+                    self.close_driver(driver, agent_for(driver))
+                else:
+                    self.close_driver(driver)
+            except Exception as e:
+                log_debug(f"Error closing pooled WebDriver: {e}", self.log_text)
+        self.drivers = []
+        log_message("Driver pool closed.", self.log_text, level="info")
+
+class OrderedResultMerger:
+    """Buffers out-of-order results and releases them in task order."""
+    def __init__(self, tasks, on_result):
+        self.tasks = tasks
+        self.on_result = on_result
+        self.pending = {}
+        self.next_index = 0
+        self.lock = threading.Lock()
+
+    def add(self, index, rows):
+        """Stores a finished task and releases every contiguous result that is ready."""
+        with self.lock:
+            self.pending[index] = rows
+            while self.next_index in self.pending:
+                self.on_result(self.tasks[self.next_index], self.pending.pop(self.next_index))
+                self.next_index += 1
+
+    def drain(self):
+        """Releases the remaining results in order, including tasks that never ran."""
+        with self.lock:
+            while self.next_index < len(self.tasks):
+                self.on_result(self.tasks[self.next_index], self.pending.pop(self.next_index, None))
+                self.next_index += 1
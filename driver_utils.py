@@ -4,9 +4,9 @@ import os
 import sys
 import random
 import time
-from selenium import webdriver
-from selenium.webdriver.firefox.options import Options
-from selenium.webdriver.firefox.service import Service
+import atexit
+import threading
+from urllib.parse import quote
 from selenium.common.exceptions import WebDriverException
 from logging_setup import log_message, log_debug
 
@@ -16,7 +16,28 @@ USER_AGENTS = [
     # Add more user agents as needed
 ]
 
-def initialize_driver(user_agent=None, log_text=None, reuse_driver=False):
+# Firefox preferences that stop downloads a text-only scrape never reads.
+LEAN_PREFERENCES = {
+    "permissions.default.image": 2,              # Block images
+    "media.autoplay.default": 5,                 # Block audio and video autoplay
+    "media.mediasource.enabled": False,          # No adaptive streaming
+    "media.hls.enabled": False,
+    "gfx.downloadable_fonts.enabled": False,     # No web fonts
+    "browser.display.use_document_fonts": 0,
+    "network.prefetch-next": False,
+    "network.dns.disablePrefetch": True,
+    "network.http.speculative-parallel-limit": 0,
+}
+
+# Blocked hosts are routed to a closed local port, so their requests fail immediately.
+BLACKHOLE_PROXY = "PROXY 127.0.0.1:9"
+
+# Idle WebDrivers kept warm between runs in this process, as (user_agent, profile, driver) tuples.
+_idle_drivers = []
+_idle_drivers_lock = threading.Lock()
+
+def initialize_driver(user_agent=None, log_text=None, reuse_driver=False, startup_delay=True,
+                      lean=False, blocked_hosts=None):
     """
     Initializes the Firefox WebDriver with dynamic user-agent and optional reuse.
 
@@ -24,12 +45,16 @@ def initialize_driver(user_agent=None, log_text=None, reuse_driver=False):
     - user_agent (str, optional): User-agent string; defaults to random choice if not provided.
     - log_text (tk.Text): Log widget in the GUI to log messages.
     - reuse_driver (bool): Flag to reuse an existing driver if possible.
+    - startup_delay (bool): Sleep a random 2-5 seconds after launch; callers that rate-limit requests themselves turn this off.
+    - lean (bool): Block images, media and web fonts for text-only scraping.
+    - blocked_hosts (list, optional): Hosts (and their subdomains) whose requests are blocked in lean mode.
 
     Returns:
     - driver (webdriver.Firefox or None): Initialized WebDriver instance or None on failure.
     """
+    profile = driver_profile(lean, blocked_hosts)
     if reuse_driver:
-        existing_driver = check_existing_driver()
+        existing_driver = check_existing_driver(user_agent, log_text, profile)
         if existing_driver:
             log_message("Reusing existing WebDriver instance.", log_text, level="info")
             return existing_driver
@@ -43,22 +68,63 @@ def initialize_driver(user_agent=None, log_text=None, reuse_driver=False):
         log_message("Cannot proceed without Geckodriver. Exiting driver initialization.", log_text, level="error")
         return None
 
+    # Imported on first launch: selenium.webdriver takes longer to import than the whole GUI takes to start
+    from selenium import webdriver
+    from selenium.webdriver.firefox.options import Options
+    from selenium.webdriver.firefox.service import Service
+
     try:
         options = Options()
         options.add_argument('--headless')
         options.set_preference("general.useragent.override", user_agent)
+        if lean:
+            for name, value in lean_preferences(blocked_hosts).items():
+                options.set_preference(name, value)
+            log_debug(f"Lean profile enabled; blocking {len(blocked_hosts or [])} hosts.", log_text)
 
         driver = webdriver.Firefox(service=Service(driver_path), options=options)
+        driver.scraper_profile = profile
         log_message("WebDriver initialized with selected User-Agent.", log_text)
-        random_delay = random.uniform(2, 5)
-        log_debug(f"Simulating delay of {random_delay:.2f} seconds.", log_text)
-        time.sleep(random_delay)
+        if startup_delay:
+            random_delay = random.uniform(2, 5)
+            log_debug(f"Simulating delay of {random_delay:.2f} seconds.", log_text)
+            time.sleep(random_delay)
 
         return driver
     except WebDriverException as e:
         log_message(f"Error initializing WebDriver: {e}", log_text, level="error")
         return None
 
+def lean_preferences(blocked_hosts=None):
+    """
+    Builds the Firefox preferences for the lean (text-only) profile.
+
+    Parameters:
+    - blocked_hosts (list, optional): Hosts to block via a proxy auto-config script.
+
+    Returns:
+    - dict: Preference name to value.
+    """
+    preferences = dict(LEAN_PREFERENCES)
+    if blocked_hosts:
+        conditions = " || ".join(
+            f'host == "{host}" || dnsDomainIs(host, ".{host}")' for host in blocked_hosts
+        )
+        pac_script = (
+            "function FindProxyForURL(url, host) { "
+            f'if ({conditions}) return "{BLACKHOLE_PROXY}"; '
+            'return "DIRECT"; }'
+        )
+        preferences["network.proxy.type"] = 2
+        preferences["network.proxy.autoconfig_url"] = "data:text/javascript," + quote(pac_script)
+    return preferences
+
+def driver_profile(lean=False, blocked_hosts=None):
+    """Returns a key describing how a driver was configured, so only matching drivers are reused."""
+    if not lean:
+        return "default"
+    return "lean:" + ",".join(sorted(blocked_hosts or []))
+
 def check_geckodriver(log_text):
     """
     Checks for Geckodriver in the current directory and system PATH.
@@ -85,12 +151,77 @@ def check_geckodriver(log_text):
     log_message("Error: Geckodriver not found.", log_text, level="error")
     return None
 
-def check_existing_driver():
+def check_existing_driver(user_agent=None, log_text=None, profile="default"):
     """
     Check if there’s an existing WebDriver instance to reuse.
 
+    Idle drivers are health-checked before they are handed out; dead ones are discarded.
+
+    Parameters:
+    - user_agent (str, optional): Only reuse a driver launched with this user-agent; any idle driver if not provided.
+    - log_text (tk.Text): Log widget in the GUI to log messages.
+    - profile (str): Only reuse a driver launched with this profile (see driver_profile).
+
     Returns:
     - WebDriver instance if available, otherwise None.
     """
-    # Placeholder for functionality to detect and reuse existing driver.
-    return None
+    while True:
+        with _idle_drivers_lock:
+            index = next(
+                (i for i, (agent, idle_profile, _) in enumerate(_idle_drivers)
+                 if idle_profile == profile and (not user_agent or agent == user_agent)),
+                None
+            )
+            if index is None:
+                return None
+            driver = _idle_drivers.pop(index)[2]
+
+        if is_driver_alive(driver):
+            return driver
+        log_debug("Discarding idle WebDriver that failed its health check.", log_text)
+        quit_driver(driver, log_text)
+
+def is_driver_alive(driver):
+    """
+    Checks whether a WebDriver session still responds.
+
+    Returns:
+    - bool: True if the browser answered a lightweight command.
+    """
+    try:
+        return bool(driver.window_handles) and driver.current_url is not None
+    except Exception:
+        return False
+
+def release_driver(driver, user_agent=None, log_text=None):
+    """
+    Returns a WebDriver to the idle set so the next run can reuse it instead of launching Firefox.
+
+    Parameters:
+    - driver (webdriver.Firefox): Driver to keep warm.
+    - user_agent (str, optional): User-agent the driver was launched with.
+    - log_text (tk.Text): Log widget in the GUI to log messages.
+    """
+    if not is_driver_alive(driver):
+        quit_driver(driver, log_text)
+        return
+    with _idle_drivers_lock:
+        _idle_drivers.append((user_agent or None, getattr(driver, 'scraper_profile', "default"), driver))
+    log_debug("WebDriver kept alive for reuse.", log_text)
+
+def quit_driver(driver, log_text=None):
+    """Quits a WebDriver, ignoring errors from sessions that are already gone."""
+    try:
+        driver.quit()
+    except Exception as e:
+        log_debug(f"Error quitting WebDriver: {e}", log_text)
+
+def shutdown_drivers():
+    """Quits every idle WebDriver; registered to run at interpreter exit."""
+    with _idle_drivers_lock:
+        drivers = [driver for _, _, driver in _idle_drivers]
+        _idle_drivers.clear()
+    for driver in drivers:
+        quit_driver(driver)
+
+atexit.register(shutdown_drivers)
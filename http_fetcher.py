@@ -0,0 +1,146 @@
+# http_fetcher.py
+
+import codecs
+import gzip
+import zlib
+import threading
+import http.client
+from urllib.parse import urlsplit, urljoin
+from logging_setup import log_debug
+
+MAX_REDIRECTS = 5
+
+class HttpFetcher:
+    """
+    Fetches pages without a browser over pooled keep-alive HTTP connections.
+
+    Idle connections are kept per (scheme, host, port) and reused by later requests,
+    so a run pays the TCP/TLS handshake once per connection rather than once per page.
+    Safe to share between threads.
+    """
+    def __init__(self, user_agent=None, timeout=20, max_idle_per_host=4, log_text=None):
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.log_text = log_text
+        self._idle = {}  # (scheme, host, port) -> list of idle connections
+        self._lock = threading.Lock()
+
+    def fetch(self, url):
+        """
+        Fetches a URL, following redirects.
+
+        Parameters:
+        - url (str): Absolute http(s) URL.
+
+        Returns:
+        - tuple: (status code, decoded response body).
+
+        Raises:
+        - OSError or http.client.HTTPException on network failures or a body that cannot be decompressed.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            status, headers, body = self._request(url)
+            location = headers.get('Location')
+            if status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                log_debug(f"Following redirect to: {url}", self.log_text)
+                continue
+            return status, self._decode(headers, body)
+        raise http.client.HTTPException(f"Too many redirects fetching {url}")
+
+    def close(self):
+        """Closes every pooled connection."""
+        with self._lock:
+            connections = [conn for idle in self._idle.values() for conn in idle]
+            self._idle.clear()
+        for conn in connections:
+            conn.close()
+
+    def _request(self, url):
+        """Performs one GET on a pooled connection, retrying once if a reused connection was dropped."""
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+        headers = {
+            'Accept': 'text/html,application/xhtml+xml',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        }
+        if self.user_agent:
+            headers['User-Agent'] = self.user_agent
+
+        conn, reused = self._acquire(key)
+        try:
+            response, body = self._send(conn, path, headers)
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            if not reused:
+                raise
+            # The server closed an idle keep-alive connection; retry on a fresh one.
+            conn = self._connect(key)
+            try:
+                response, body = self._send(conn, path, headers)
+            except BaseException:
+                conn.close()
+                raise
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+        return response.status, response.headers, body
+
+    def _send(self, conn, path, headers):
+        conn.request('GET', path, headers=headers)
+        response = conn.getresponse()
+        return response, response.read()
+
+    def _acquire(self, key):
+        """Returns (connection, reused) for the given host key."""
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._connect(key), False
+
+    def _release(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _connect(self, key):
+        scheme, host, port = key
+        if scheme == 'https':
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    @staticmethod
+    def _decode(headers, body):
+        """
+        Decompresses and decodes a response body using its Content-Encoding and charset.
+
+        An unknown charset falls back to UTF-8. A truncated or corrupt compressed body raises
+        http.client.HTTPException, so callers treat it like any other failed fetch.
+        """
+        encoding = (headers.get('Content-Encoding') or '').lower()
+        try:
+            if encoding == 'gzip':
+                body = gzip.decompress(body)
+            elif encoding == 'deflate':
+                try:
+                    body = zlib.decompress(body)
+                except zlib.error:
+                    # Some servers send raw deflate data without the zlib header
+                    body = zlib.decompress(body, -zlib.MAX_WBITS)
+        except (EOFError, OSError, zlib.error) as e:
+            raise http.client.HTTPException(f"Could not decompress {encoding} response: {e}") from e
+        charset = headers.get_content_charset() or 'utf-8'
+        try:
+            codecs.lookup(charset)
+        except LookupError:
+            charset = 'utf-8'
+        return body.decode(charset, errors='replace')
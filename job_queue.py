@@ -0,0 +1,238 @@
+# job_queue.py
+
+import csv
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from logging_setup import log_message, log_debug
+from result_writer import RESULT_HEADER
+
+QUEUE_FILE = 'job_queue.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    query TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',  -- pending, leased, done, failed, skipped
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    last_error TEXT,
+    updated REAL NOT NULL,
+    UNIQUE (query, page)
+);
+CREATE INDEX IF NOT EXISTS tasks_claim ON tasks (status, lease_expires);
+CREATE TABLE IF NOT EXISTS results (
+    task_id INTEGER NOT NULL REFERENCES tasks (id),
+    position INTEGER NOT NULL,
+    row TEXT NOT NULL,  -- JSON list, one CSV row
+    PRIMARY KEY (task_id, position)
+);
+"""
+
+def default_worker_id():
+    """Returns an id that is unique per process across machines sharing the queue."""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+class JobQueue:
+    """
+    Durable (query, page) task queue in a local SQLite file, shared by worker processes.
+
+    Workers claim a task with a lease. A task whose lease expires (the worker crashed or hung)
+    becomes claimable again, until it has been attempted `max_attempts` times. Results are
+    stored with the task, so every finished page survives any single worker.
+
+    Several machines can share the file over a network filesystem only if it supports POSIX
+    locks reliably; otherwise run one queue per machine.
+    """
+    def __init__(self, path=QUEUE_FILE, lease_seconds=300, max_attempts=3, log_text=None):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.log_text = log_text
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    def enqueue(self, query, pages):
+        """Adds (query, page) tasks; pages already queued for the query are left as they are. Returns the number added."""
+        now = time.time()
+        with self._transaction():
+            cursor = self.connection.executemany(
+                "INSERT OR IGNORE INTO tasks (query, page, updated) VALUES (?, ?, ?)",
+                [(query, page, now) for page in pages]
+            )
+        log_message(f"Queued {cursor.rowcount} pages for '{query}'.", self.log_text, level="info")
+        return cursor.rowcount
+
+    def import_jsonl(self, filename, default_pages=1):
+        """
+        Enqueues jobs from a JSON Lines file.
+
+        Each line is an object with a "query" and optionally "max_pages" (pages 1..max_pages)
+        or an explicit "pages" list. Lines without a "query" are skipped.
+
+        Returns:
+        - int: Number of tasks added.
+        """
+        added = 0
+        with open(filename, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                job = json.loads(line)
+                if not isinstance(job, dict) or not job.get('query'):
+                    log_debug(f"Skipping line {line_number} of {filename}: no query.", self.log_text)
+                    continue
+                pages = job.get('pages') or range(1, int(job.get('max_pages', default_pages)) + 1)
+                added += self.enqueue(job['query'], [int(page) for page in pages])
+        return added
+
+    def claim(self, worker_id):
+        """
+        Leases the next runnable task to a worker.
+
+        Returns:
+        - tuple or None: (task id, query, page), or None if nothing is runnable right now.
+        """
+        now = time.time()
+        with self._transaction():
+            # Expired leases that used up their attempts will not be retried
+            self.connection.execute(
+                "UPDATE tasks SET status = 'failed', last_error = COALESCE(last_error, 'lease expired'), updated = ? "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, now, self.max_attempts)
+            )
+            task = self.connection.execute(
+                "SELECT id, query, page FROM tasks "
+                "WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?) "
+                "ORDER BY page, id LIMIT 1",
+                (now,)
+            ).fetchone()
+            if task is None:
+                return None
+            self.connection.execute(
+                "UPDATE tasks SET status = 'leased', attempts = attempts + 1, lease_owner = ?, lease_expires = ?, "
+                "updated = ? WHERE id = ?",
+                (worker_id, now + self.lease_seconds, now, task[0])
+            )
+        return task
+
+    def complete(self, task_id, worker_id, rows):
+        """Stores a task's rows and marks it done; returns False if the worker no longer holds the lease."""
+        with self._transaction():
+            if not self._holds_lease(task_id, worker_id):
+                return False
+            self.connection.execute("DELETE FROM results WHERE task_id = ?", (task_id,))
+            self.connection.executemany(
+                "INSERT INTO results (task_id, position, row) VALUES (?, ?, ?)",
+                [(task_id, position, json.dumps(list(row))) for position, row in enumerate(rows)]
+            )
+            self.connection.execute(
+                "UPDATE tasks SET status = 'done', lease_owner = NULL, lease_expires = NULL, updated = ? WHERE id = ?",
+                (time.time(), task_id)
+            )
+        return True
+
+    def fail(self, task_id, worker_id, error):
+        """Releases a failed task for a retry, or marks it failed once its attempts are used up."""
+        with self._transaction():
+            if not self._holds_lease(task_id, worker_id):
+                return
+            self.connection.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "lease_owner = NULL, lease_expires = NULL, last_error = ?, updated = ? WHERE id = ?",
+                (self.max_attempts, str(error), time.time(), task_id)
+            )
+
+    def release(self, task_id, worker_id):
+        """Puts a task the worker was stopped during back to pending, without counting the attempt."""
+        with self._transaction():
+            if not self._holds_lease(task_id, worker_id):
+                return
+            self.connection.execute(
+                "UPDATE tasks SET status = 'pending', attempts = MAX(attempts - 1, 0), lease_owner = NULL, "
+                "lease_expires = NULL, updated = ? WHERE id = ?",
+                (time.time(), task_id)
+            )
+
+    def renew(self, task_id, worker_id):
+        """Extends a task's lease by `lease_seconds` from now; returns False if the worker no longer holds it."""
+        now = time.time()
+        with self._transaction():
+            cursor = self.connection.execute(
+                "UPDATE tasks SET lease_expires = ?, updated = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (now + self.lease_seconds, now, task_id, worker_id)
+            )
+        return cursor.rowcount > 0
+
+    def skip_pages_after(self, query, last_page):
+        """Drops the not yet started pages of a query beyond its last page of results."""
+        with self._transaction():
+            cursor = self.connection.execute(
+                "UPDATE tasks SET status = 'skipped', updated = ? WHERE query = ? AND page > ? AND status = 'pending'",
+                (time.time(), query, last_page)
+            )
+        if cursor.rowcount:
+            log_message(f"Skipped {cursor.rowcount} pages of '{query}' past page {last_page}.", self.log_text, level="info")
+
+    def counts(self, query=None):
+        """Returns the number of tasks per status, for all queries or one."""
+        sql = "SELECT status, COUNT(*) FROM tasks"
+        params = ()
+        if query is not None:
+            sql += " WHERE query = ?"
+            params = (query,)
+        return dict(self.connection.execute(sql + " GROUP BY status", params).fetchall())
+
+    def has_unfinished(self):
+        """Whether any task is still pending or leased."""
+        return self.connection.execute(
+            "SELECT 1 FROM tasks WHERE status IN ('pending', 'leased') LIMIT 1"
+        ).fetchone() is not None
+
+    def queries(self):
+        """Returns every query in the queue."""
+        return [query for (query,) in self.connection.execute("SELECT DISTINCT query FROM tasks ORDER BY query")]
+
+    def export_csv(self, query, filename, header=RESULT_HEADER):
+        """Writes a query's finished rows to a CSV file in page order; returns the number of rows."""
+        rows = self.connection.execute(
+            "SELECT results.row FROM results JOIN tasks ON tasks.id = results.task_id "
+            "WHERE tasks.query = ? AND tasks.status = 'done' ORDER BY tasks.page, results.position",
+            (query,)
+        )
+        count = 0
+        with open(filename, mode='w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(header)
+            for (row,) in rows:
+                writer.writerow(json.loads(row))
+                count += 1
+        log_message(f"Exported {count} rows for '{query}' to {filename}", self.log_text, level="info")
+        return count
+
+    def close(self):
+        """Closes the database connection."""
+        self.connection.close()
+
+    def _holds_lease(self, task_id, worker_id):
+        return self.connection.execute(
+            "SELECT 1 FROM tasks WHERE id = ? AND status = 'leased' AND lease_owner = ?", (task_id, worker_id)
+        ).fetchone() is not None
+
+    @contextmanager
+    def _transaction(self):
+        """BEGIN IMMEDIATE ... COMMIT, so concurrent workers queue for the write lock instead of failing on upgrade."""
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
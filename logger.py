@@ -8,6 +8,7 @@ from logging_setup import log_message, log_debug, log_error
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.common.by import By
 from driver_utils import initialize_driver
+from page_readiness import wait_for_containers
 
 LOG_FILE = 'scraper.log'
 MAX_LOG_SIZE = 5 * 1024 * 1024  # 5 MB
@@ -72,9 +73,15 @@ class ScraperManager:
                 current_url = f"{base_url}{self.config.get('page_param_var', '')}{page_num}"
                 logger.info(f"Navigating to URL: {current_url}")
                 self.driver.get(current_url)
-                time.sleep(int(self.config.get('scroll_delay_var', 25)) / 1000)
-
                 container_selector = self.config.get('container_selector_var', '')
+                _, settle_seconds, _ = wait_for_containers(
+                    self.driver,
+                    container_selector,
+                    int(self.config.get('expected_containers_var', 0) or 0),
+                    int(self.config.get('element_wait_timeout_var', 20) or 20)
+                )
+                logger.debug(f"Page {page_num} settled in {settle_seconds:.2f} s")
+
                 try:
                     containers = self.driver.find_elements(By.CSS_SELECTOR, container_selector)
                     self.containers_found_label.config(text=f"Containers Found: {len(containers)}")
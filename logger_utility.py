@@ -27,7 +27,7 @@ class LoggerUtility:
         self.log_queue = log_queue
 
         # File handler with rotation
-        file_handler = RotatingFileHandler(log_file, maxBytes=5*1024*1024, backupCount=3)
+        file_handler = RotatingFileHandler(log_file, maxBytes=5*1024*1024, backupCount=3, delay=True)  # Opened on first write
         file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(module)s.%(funcName)s - %(message)s')
         file_handler.setFormatter(file_formatter)
         self.logger.addHandler(file_handler)
@@ -1,11 +1,20 @@
 # logging_setup.py
 
-import tkinter as tk
 import queue
 from logger_utility import LoggerUtility
 
-# Create a centralized LoggerUtility instance
-logger = LoggerUtility()
+_logger = None
+
+def get_logger():
+    """
+    Returns the centralized LoggerUtility, creating it on first use.
+
+    Deferring this keeps importing the module cheap; the log file is opened by the first message.
+    """
+    global _logger
+    if _logger is None:
+        _logger = LoggerUtility()
+    return _logger
 
 def log_message(message, log_text=None, level="info"):
     """
@@ -16,9 +25,9 @@ def log_message(message, log_text=None, level="info"):
     - log_text (tk.Text, optional): Text widget for GUI logging.
     - level (str): Log level (info, warning, error, debug).
     """
-    logger.log(level, message, log_text)
+    get_logger().log(level, message, log_text)
     if log_text:
-        logger.log(level, f"Log message at level '{level}': {message}", log_text)
+        get_logger().log(level, f"Log message at level '{level}': {message}", log_text)
 
 def log_error(message, log_text=None):
     """
@@ -30,7 +39,7 @@ def log_error(message, log_text=None):
     """
     log_message(message, log_text, level="error")
     if log_text:
-        logger.log("debug", f"Error logged: {message}", log_text)
+        get_logger().log("debug", f"Error logged: {message}", log_text)
 
 def log_debug(message, log_text=None):
     """
@@ -47,13 +56,13 @@ def flush_logs():
     Ensures all log handlers flush their output, committing all logged messages.
     """
     try:
-        for handler in logger.logger.handlers:
+        for handler in get_logger().logger.handlers:
             if hasattr(handler, 'flush'):
                 handler.flush()
-                logger.log("debug", "Log handler flushed", None)
-        logger.log("info", "All log handlers flushed")
+                get_logger().log("debug", "Log handler flushed", None)
+        get_logger().log("info", "All log handlers flushed")
     except Exception as e:
-        logger.log("error", f"Error flushing log handlers: {e}")
+        get_logger().log("error", f"Error flushing log handlers: {e}")
 
 def backup_log_file(log_text=None):
     """
@@ -63,7 +72,7 @@ def backup_log_file(log_text=None):
     - log_text (tk.Text, optional): Text widget for GUI logging.
     """
     try:
-        logger.backup_log_file()
+        get_logger().backup_log_file()
         log_message("Log file backed up successfully.", log_text, level="info")
     except Exception as e:
         log_error(f"Failed to backup log file: {e}", log_text)
@@ -76,7 +85,7 @@ def clear_log_file(log_text=None):
     - log_text (tk.Text, optional): Text widget for GUI logging.
     """
     try:
-        logger.clear_log_file()
+        get_logger().clear_log_file()
         log_message("Log file cleared for new session.", log_text, level="info")
     except Exception as e:
         log_error(f"Failed to clear log file: {e}", log_text)
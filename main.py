@@ -6,6 +6,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from logging_setup import log_message, log_debug, log_error, flush_logs, setup_gui_log_processor
 from scraper_manager import ScraperManager
+from progress_reporter import TkProgressReporter
 from config_manager import (
     load_field_values,
     save_field_values,
@@ -107,19 +108,21 @@ def main():
     setup_advanced_settings(advanced_frame, field_vars, previous_values)
 
     # Scraper Manager Initialization
+    reporter = TkProgressReporter(
+        root,
+        status_bar=status_bar,
+        labels={
+            'user_agent': user_agent_label,
+            'containers_found': containers_found_label,
+            'page_number': page_number_label,
+            'products_found': total_products_found_label,
+            'products_skipped': total_products_skipped_label
+        }
+    )
     scraper_manager = ScraperManager(
         config={key: var.get() for key, var in field_vars.items()},
         log_text=gui_log_queue,
-        results_text=None,
-        progress_bar=None,
-        root=root,
-        user_agent_label=user_agent_label,
-        status_bar=status_bar,
-        containers_found_label=containers_found_label,
-        page_number_label=page_number_label,
-        total_products_found_label=total_products_found_label,
-        total_products_skipped_label=total_products_skipped_label,
-        selectors_found_label=None
+        reporter=reporter
     )
 
     # Scraping Controls
@@ -146,10 +149,25 @@ def initialize_field_vars():
         'secondary_price_indicator_var', 'secondary_price_selectors_var',
         'scroll_delay_var', 'element_wait_timeout_var', 'display_no_price_var',
         'user_agent_change_interval_var', 'user_agent_var', 'expected_containers_var',
-        'expected_number_var', 'potential_selectors_var'
+        'expected_number_var', 'potential_selectors_var', 'scrape_mode_var', 'worker_count_var',
+        'fetch_mode_var', 'rate_limit_var', 'rate_burst_var', 'blocked_hosts_var',
+        'extraction_mode_var', 'page_cache_ttl_var', 'page_cache_max_mb_var', 'pagination_selector_var',
+        'empty_page_limit_var', 'batch_queries_var', 'job_queue_db_var', 'job_lease_seconds_var',
+        'job_max_attempts_var', 'retry_attempts_var', 'retry_base_delay_var', 'retry_max_delay_var',
+        'circuit_failure_threshold_var', 'circuit_cooldown_var', 'price_locale_var', 'result_flush_rows_var',
+        'result_flush_seconds_var', 'sqlite_db_var', 'price_history_db_var', 'title_match_threshold_var',
+        'dedup_mode_var', 'dedup_filter_var', 'dedup_capacity_var'
     ]
     field_vars = {name: tk.StringVar() for name in field_names}
     field_vars['display_no_price_var'] = tk.BooleanVar()
+    field_vars['keep_driver_alive_var'] = tk.BooleanVar(value=True)
+    field_vars['lean_mode_var'] = tk.BooleanVar()
+    field_vars['report_page_weight_var'] = tk.BooleanVar()
+    field_vars['auto_probe_selectors_var'] = tk.BooleanVar(value=True)
+    field_vars['page_cache_var'] = tk.BooleanVar()
+    field_vars['checkpoint_var'] = tk.BooleanVar(value=True)
+    field_vars['stop_at_end_of_results_var'] = tk.BooleanVar(value=True)
+    field_vars['fuzzy_title_matching_var'] = tk.BooleanVar()
     return field_vars
 
 def setup_general_settings(frame, field_vars, previous_values):
@@ -161,7 +179,10 @@ def setup_general_settings(frame, field_vars, previous_values):
         ('price_var', 'Price Range:', 'Price filter for products'),
         ('url_entry_var', 'Base URL:', 'Base URL of the site to scrape'),
         ('url_path_var', 'URL Path:', 'Path after the base URL for specific searches'),
-        ('csv_filename_var', 'CSV Filename:', 'Name of the CSV file for saving results')
+        ('csv_filename_var', 'CSV Filename:', 'Name of the CSV file for saving results'),
+        ('sqlite_db_var', 'SQLite Database:', 'Also store results in this SQLite file (leave empty for CSV only)'),
+        ('price_history_db_var', 'Price History:', 'Database that tracks each product\'s price over time (leave empty to disable)'),
+        ('batch_queries_var', 'Batch Queries:', 'Comma-separated search queries scraped together by Run Batch')
     ]
 
     for row, (var_name, label_text, tooltip_text) in enumerate(general_fields):
@@ -179,9 +200,27 @@ def setup_advanced_settings(frame, field_vars, previous_values):
         ('container_selector_var', 'Container Selector:', 'CSS selector for the product container'),
         ('title_selector_var', 'Title Selector:', 'CSS selector for product title'),
         ('price_selectors_var', 'Price Selector:', 'CSS selector for primary price'),
+        ('price_locale_var', 'Price Format:', 'auto, decimal_point (1,299.99) or decimal_comma (1.299,99)'),
+        ('dedup_mode_var', 'Dedup Mode:', 'off, run (skip products repeated within a run) or persistent (skip products seen in any earlier run)'),
+        ('title_match_threshold_var', 'Title Match Threshold:', 'Similarity (0-1) at which a reworded title joins a known product\'s price history'),
+        ('pagination_selector_var', 'Pagination Selector:', 'CSS selector for page-number links; the highest number caps the pages scraped'),
+        ('empty_page_limit_var', 'Empty Page Limit:', 'Consecutive empty or all-duplicate pages that end the run'),
         ('scroll_delay_var', 'Scroll Delay:', 'Time delay for page scrolling'),
         ('element_wait_timeout_var', 'Element Timeout:', 'Timeout for waiting for elements to load'),
-        ('user_agent_var', 'User Agent:', 'User-Agent string for scraping requests')
+        ('retry_attempts_var', 'Retry Attempts:', 'Attempts per page load before the page is marked failed'),
+        ('circuit_failure_threshold_var', 'Circuit Threshold:', 'Consecutive failures that pause requests to a host'),
+        ('circuit_cooldown_var', 'Circuit Cooldown:', 'Seconds a host is paused after too many failures'),
+        ('user_agent_var', 'User Agent:', 'User-Agent string for scraping requests'),
+        ('user_agent_change_interval_var', 'UA Change Interval:', 'Pages per driver before switching to the next user agent (0 disables)'),
+        ('scrape_mode_var', 'Scrape Mode:', 'sequential (one driver), pool (parallel drivers) or async (rate-limited asyncio engine)'),
+        ('worker_count_var', 'Worker Count:', 'Number of parallel drivers in pool and async modes'),
+        ('fetch_mode_var', 'Fetch Mode:', 'selenium (browser) or http (pooled HTTP, Selenium fallback per page)'),
+        ('rate_limit_var', 'Rate Limit:', 'Requests per second per host in async mode (0 = unlimited)'),
+        ('rate_burst_var', 'Rate Burst:', 'Requests allowed back-to-back per host before the rate limit applies'),
+        ('blocked_hosts_var', 'Blocked Hosts:', 'Comma-separated hosts blocked in lean mode (ads, trackers)'),
+        ('extraction_mode_var', 'Extraction Mode:', 'elements (per-container queries), script (one injected script per page) or source (parse page HTML offline)'),
+        ('page_cache_ttl_var', 'Cache TTL:', 'Seconds a cached page stays valid when the page cache is enabled'),
+        ('page_cache_max_mb_var', 'Cache Size (MB):', 'Maximum page cache size; least recently used pages are evicted first')
     ]
 
     for row, (var_name, label_text, tooltip_text) in enumerate(advanced_fields):
@@ -209,14 +248,21 @@ def setup_menu(root):
     help_menu.add_command(label='About', command=lambda: show_about())
 
 def create_scraping_buttons(control_frame, scraper_manager, gui_log_queue):
-    """Create Start, Stop, and Pause buttons for scraping control."""
+    """Create Start, Resume, Run Batch, Stop, and Pause buttons for scraping control."""
     ttk.Button(control_frame, text="Start Scraping", command=lambda: start_scraping(scraper_manager)).pack(side=tk.LEFT, padx=5)
+    ttk.Button(control_frame, text="Resume", command=lambda: start_scraping(scraper_manager, resume=True)).pack(side=tk.LEFT, padx=5)
+    ttk.Button(control_frame, text="Run Batch", command=lambda: start_batch_scraping(scraper_manager)).pack(side=tk.LEFT, padx=5)
     ttk.Button(control_frame, text="Stop Scraping", command=scraper_manager.stop_scraping).pack(side=tk.LEFT, padx=5)
     ttk.Button(control_frame, text="Pause", command=scraper_manager.toggle_pause).pack(side=tk.LEFT, padx=5)
 
-def start_scraping(scraper_manager):
-    """Starts the scraping process in a new thread."""
-    threading.Thread(target=scraper_manager.start_scraping, daemon=True).start()
+def start_scraping(scraper_manager, resume=False):
+    """Starts the scraping process in a new thread, optionally resuming the last interrupted run."""
+    threading.Thread(target=scraper_manager.start_scraping, kwargs={'resume': resume}, daemon=True).start()
+    flush_logs()
+
+def start_batch_scraping(scraper_manager):
+    """Starts a batch run of all configured queries in a new thread."""
+    threading.Thread(target=scraper_manager.start_batch_scraping, daemon=True).start()
     flush_logs()
 
 def setup_display_widgets(root, gui_log_queue):
@@ -0,0 +1,131 @@
+# page_cache.py
+
+import gzip
+import hashlib
+import os
+import threading
+import time
+import zlib
+from logging_setup import log_debug, log_error
+
+CACHE_DIR = 'page_cache'
+
+class PageCache:
+    """
+    Content-addressed on-disk cache of fetched page HTML.
+
+    Each page is stored gzipped under the SHA-256 of its URL. Entries expire after `ttl_seconds`
+    (by modification time, i.e. when they were stored), and once the cache grows past `max_bytes`
+    the least recently used entries (by access time, set explicitly on every hit) are evicted.
+    """
+    def __init__(self, directory=CACHE_DIR, ttl_seconds=3600, max_bytes=200 * 1024 * 1024, log_text=None):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.log_text = log_text
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.total_bytes = sum(size for _, _, size in self._entries())
+
+    def get(self, url):
+        """Returns the cached HTML for a URL, or None on a miss or an expired entry."""
+        path = self._path(url)
+        now = time.time()
+        try:
+            stored_at = os.stat(path).st_mtime
+            if now - stored_at > self.ttl_seconds:
+                self._remove(path)
+                return self._miss(url, "expired")
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                page_html = f.read()
+            os.utime(path, (now, stored_at))  # Record the access for LRU, keep the store time
+        except FileNotFoundError:
+            return self._miss(url, "not cached")
+        except (OSError, EOFError, zlib.error, UnicodeDecodeError) as e:
+            log_error(f"Discarding unreadable cache entry for {url}: {e}", self.log_text)
+            self._remove(path)
+            return self._miss(url, "unreadable")
+
+        with self.lock:
+            self.hits += 1
+        log_debug(f"Page cache hit: {url}", self.log_text)
+        return page_html
+
+    def put(self, url, page_html):
+        """Stores a page, replacing any previous entry atomically, then evicts if over the size limit."""
+        path = self._path(url)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+                f.write(page_html)
+            os.replace(temp_path, path)
+            size = os.path.getsize(path)
+        except OSError as e:
+            log_error(f"Could not cache page {url}: {e}", self.log_text)
+            return
+
+        with self.lock:
+            self.total_bytes += size - old_size
+            over_limit = self.total_bytes > self.max_bytes
+        if over_limit:
+            self.evict()
+
+    def evict(self):
+        """Deletes least recently used entries until the cache is back under 90% of its size limit."""
+        target = self.max_bytes * 0.9
+        with self.lock:
+            entries = sorted(self._entries())  # Oldest access time first
+            removed = 0
+            for _, path, size in entries:
+                if self.total_bytes <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                self.total_bytes -= size
+                removed += 1
+        log_debug(f"Page cache evicted {removed} entries.", self.log_text)
+
+    def hit_ratio(self):
+        """Returns the fraction of lookups that were hits (0.0 before any lookup)."""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return self.hits / lookups if lookups else 0.0
+
+    def summary(self):
+        """Returns a short 'hits/lookups (ratio)' description for the status bar."""
+        with self.lock:
+            hits, lookups = self.hits, self.hits + self.misses
+        return f"Cache hits: {hits}/{lookups} ({self.hit_ratio():.0%})"
+
+    def _miss(self, url, reason):
+        with self.lock:
+            self.misses += 1
+        log_debug(f"Page cache miss ({reason}): {url}", self.log_text)
+        return None
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.html.gz')
+
+    def _remove(self, path):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self.lock:
+            self.total_bytes -= size
+
+    def _entries(self):
+        """Yields (access time, path, size) for every cache entry."""
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.html.gz'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # Removed by another thread or run since the directory was listed
+                yield stat.st_atime, entry.path, stat.st_size
@@ -0,0 +1,126 @@
+# page_parser.py
+
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+from cssselect import SelectorError
+
+# Elements that are in the DOM but not rendered, so a browser's element text would not include them.
+SKIPPED_TAGS = {'script', 'style', 'noscript', 'template'}
+HIDDEN_CLASSES = {'a-offscreen', 'sr-only', 'visually-hidden'}
+
+class PageParser:
+    """
+    Extracts product data from raw page HTML using CSS selectors compiled once up front.
+
+    Text is gathered the way WebElement.text reads it: hidden and screen-reader-only nodes are
+    skipped and whitespace is collapsed, so the same title/price selectors work on both paths.
+    """
+    def __init__(self, container_selector, title_selector, price_selector,
+                 secondary_price_selector='', secondary_price_indicator=''):
+        self.container_selector = CSSSelector(container_selector)
+        self.title_selector = CSSSelector(title_selector)
+        self.price_selector = CSSSelector(price_selector)
+        self.secondary_price_selector = CSSSelector(secondary_price_selector) if secondary_price_selector else None
+        self.secondary_price_indicator = secondary_price_indicator.lower()
+
+    def parse(self, page_html):
+        """
+        Parses a page and returns the raw text of every container's title, price and secondary price.
+
+        Parameters:
+        - page_html (str): Full HTML of the page.
+
+        Returns:
+        - list: One (title_text, price_text, secondary_price_text) tuple per container; any may be None when missing.
+        """
+        if not page_html:
+            return []
+        document = lxml_html.fromstring(page_html)
+        return [
+            (self._first_text(self.title_selector, container), self._first_text(self.price_selector, container),
+             self._secondary_price_text(container))
+            for container in self.container_selector(document)
+        ]
+
+    def set_container_selector(self, container_selector):
+        """Recompiles the container selector, e.g. after selector probing picks a new one."""
+        self.container_selector = CSSSelector(container_selector)
+
+    def count_matches(self, page_html, selectors):
+        """Returns how many elements each selector matches; invalid selectors count as 0."""
+        if not page_html:
+            return [0] * len(selectors)
+        document = lxml_html.fromstring(page_html)
+        counts = []
+        for selector in selectors:
+            try:
+                counts.append(len(CSSSelector(selector)(document)))
+            except SelectorError:
+                counts.append(0)
+        return counts
+
+    def texts(self, page_html, selector):
+        """Returns the visible text of every element a selector matches; an invalid selector matches nothing."""
+        if not page_html:
+            return []
+        try:
+            compiled = CSSSelector(selector)
+        except SelectorError:
+            return []
+        return [visible_text(element) for element in compiled(lxml_html.fromstring(page_html))]
+
+    def _secondary_price_text(self, container):
+        """Same rule as bulk_extraction's script: the secondary price nearest the indicator text."""
+        if self.secondary_price_selector is None:
+            return None
+        if not self.secondary_price_indicator:
+            return self._first_text(self.secondary_price_selector, container)
+
+        for element in container.iter():
+            if not isinstance(element.tag, str):
+                continue
+            if self.secondary_price_indicator in (element.text or '').lower():
+                start = element
+            elif self.secondary_price_indicator in (element.tail or '').lower() and element is not container:
+                start = element.getparent()
+            else:
+                continue
+            for ancestor in [start, *start.iterancestors()]:
+                matches = [match for match in self.secondary_price_selector(ancestor) if match is not ancestor]
+                if matches:
+                    return visible_text(matches[0])
+                if ancestor is container:
+                    break
+        return None
+
+    @staticmethod
+    def _first_text(selector, container):
+        matches = selector(container)
+        if not matches:
+            return None
+        return visible_text(matches[0])
+
+def visible_text(element):
+    """Returns the rendered text of an element with whitespace collapsed."""
+    parts = []
+    _collect_text(element, parts, include_tail=False)
+    return ' '.join(''.join(parts).split())
+
+def _collect_text(element, parts, include_tail=True):
+    if not _is_hidden(element):
+        if element.text:
+            parts.append(element.text)
+        for child in element:
+            _collect_text(child, parts)
+    if include_tail and element.tail:
+        parts.append(element.tail)
+
+def _is_hidden(element):
+    if not isinstance(element.tag, str) or element.tag in SKIPPED_TAGS:
+        return True
+    if element.get('hidden') is not None:
+        return True
+    style = (element.get('style') or '').replace(' ', '').lower()
+    if 'display:none' in style or 'visibility:hidden' in style:
+        return True
+    return bool(HIDDEN_CLASSES.intersection((element.get('class') or '').split()))
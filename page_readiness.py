@@ -0,0 +1,67 @@
+# page_readiness.py
+
+import time
+from selenium.common.exceptions import TimeoutException
+
+# Value of selenium's By.CSS_SELECTOR; importing By would load selenium.webdriver at startup.
+CSS_SELECTOR = 'css selector'
+
+class ContainersSettled:
+    """
+    WebDriverWait condition that is met once the product grid has rendered.
+
+    The page counts as ready when the container selector matches at least `expected_count`
+    elements, or when the match count has stopped growing for `stable_polls` polls. A count of 0
+    only settles once document.readyState is 'complete', so an empty results page is accepted
+    without waiting out the timeout while a page still loading is not. The settled count is
+    left in `last_count`.
+    """
+    def __init__(self, container_selector, expected_count=0, stable_polls=2):
+        self.container_selector = container_selector
+        self.expected_count = expected_count
+        self.stable_polls = stable_polls
+        self.last_count = None
+        self.unchanged_polls = 0
+
+    def __call__(self, driver):
+        count = len(driver.find_elements(CSS_SELECTOR, self.container_selector))
+        if self.expected_count and count >= self.expected_count:
+            self.last_count = count
+            return True
+
+        if count == self.last_count and (count > 0 or self.document_complete(driver)):
+            self.unchanged_polls += 1
+            if self.unchanged_polls >= self.stable_polls:
+                return True
+        else:
+            self.unchanged_polls = 0
+        self.last_count = count
+        return False
+
+    @staticmethod
+    def document_complete(driver):
+        return driver.execute_script("return document.readyState") == 'complete'
+
+def wait_for_containers(driver, container_selector, expected_count=0, timeout=20, poll_frequency=0.25):
+    """
+    Waits until the product containers on the current page have settled.
+
+    Parameters:
+    - driver (webdriver.Firefox): Driver with the page loaded.
+    - container_selector (str): CSS selector for product containers.
+    - expected_count (int): Container count that means the page is complete; 0 to rely on the count settling.
+    - timeout (float): Maximum seconds to wait.
+    - poll_frequency (float): Seconds between polls.
+
+    Returns:
+    - tuple: (container count, seconds until settled, whether the wait timed out).
+    """
+    from selenium.webdriver.support.ui import WebDriverWait  # Deferred: pulls in the whole WebDriver client
+
+    condition = ContainersSettled(container_selector, expected_count)
+    started = time.monotonic()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(condition)
+        return condition.last_count, time.monotonic() - started, False
+    except TimeoutException:
+        return condition.last_count or 0, time.monotonic() - started, True
@@ -0,0 +1,116 @@
+# page_weight.py
+
+import json
+import os
+import threading
+from urllib.parse import urlsplit
+from logging_setup import log_message, log_debug
+
+BASELINE_FILE = 'page_weight_baseline.json'
+
+# Bytes transferred and load time of the current page, from the Navigation and Resource Timing APIs.
+PAGE_WEIGHT_SCRIPT = """
+const navigation = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+let bytes = navigation ? navigation.transferSize : 0;
+for (const entry of resources) {
+    bytes += entry.transferSize || entry.encodedBodySize || 0;
+}
+const loadMs = navigation ? (navigation.loadEventEnd || navigation.domContentLoadedEventEnd) - navigation.startTime : 0;
+return {bytes: bytes, requests: resources.length + 1, load_ms: loadMs};
+"""
+
+class PageWeightMeter:
+    """
+    Records the bytes transferred and load time of each page.
+
+    Runs with the normal profile store their per-host averages as a baseline; lean runs report
+    the bytes and time saved per page against that baseline.
+    """
+    def __init__(self, lean=False, baseline_file=BASELINE_FILE, log_text=None):
+        self.lean = lean
+        self.baseline_file = baseline_file
+        self.log_text = log_text
+        self.baselines = self._load_baselines()
+        self.samples = {}  # host -> list of (bytes, load_ms)
+        self.lock = threading.Lock()
+
+    def measure(self, driver, url, page_number):
+        """
+        Measures the page currently loaded in the driver and logs its weight.
+
+        Returns:
+        - dict or None: {'bytes', 'requests', 'load_ms'} for the page, or None if the browser did not report timings.
+        """
+        try:
+            weight = driver.execute_script(PAGE_WEIGHT_SCRIPT)
+        except Exception as e:
+            log_debug(f"Could not measure page weight for page {page_number}: {e}", self.log_text)
+            return None
+        if not weight:
+            return None
+
+        host = urlsplit(url).netloc
+        with self.lock:
+            self.samples.setdefault(host, []).append((weight['bytes'], weight['load_ms']))
+
+        message = (f"Page {page_number}: {format_bytes(weight['bytes'])} in {weight['requests']} requests, "
+                   f"loaded in {weight['load_ms'] / 1000:.2f} s")
+        baseline = self.baselines.get(host)
+        if self.lean and baseline:
+            message += (f" (saved {format_bytes(baseline['bytes'] - weight['bytes'])} and "
+                        f"{(baseline['load_ms'] - weight['load_ms']) / 1000:.2f} s vs. full profile)")
+        log_message(message, self.log_text, level="info")
+        return weight
+
+    def finish(self):
+        """Logs the run totals and, for full-profile runs, stores the per-host baseline."""
+        with self.lock:
+            samples = {host: list(values) for host, values in self.samples.items()}
+
+        for host, values in samples.items():
+            average_bytes = sum(value[0] for value in values) / len(values)
+            average_ms = sum(value[1] for value in values) / len(values)
+            baseline = self.baselines.get(host)
+            if self.lean and baseline:
+                log_message(
+                    f"Lean profile on {host}: average {format_bytes(average_bytes)} and {average_ms / 1000:.2f} s per page, "
+                    f"saving {format_bytes(baseline['bytes'] - average_bytes)} and "
+                    f"{(baseline['load_ms'] - average_ms) / 1000:.2f} s per page over {len(values)} pages.",
+                    self.log_text, level="info")
+            elif self.lean:
+                log_message(f"No full-profile baseline for {host}; run once without lean mode to measure savings.",
+                            self.log_text, level="info")
+            else:
+                self.baselines[host] = {'bytes': average_bytes, 'load_ms': average_ms, 'pages': len(values)}
+
+        if not self.lean and samples:
+            self._save_baselines()
+
+    def _load_baselines(self):
+        if not os.path.exists(self.baseline_file):
+            return {}
+        try:
+            with open(self.baseline_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            log_debug(f"Ignoring unreadable page weight baseline: {e}", self.log_text)
+            return {}
+
+    def _save_baselines(self):
+        try:
+            with open(self.baseline_file, 'w', encoding='utf-8') as f:
+                json.dump(self.baselines, f, indent=4)
+            log_debug(f"Page weight baseline saved to '{self.baseline_file}'.", self.log_text)
+        except OSError as e:
+            log_debug(f"Could not save page weight baseline: {e}", self.log_text)
+
+def format_bytes(size):
+    """Formats a byte count as B/KB/MB."""
+    sign = '-' if size < 0 else ''
+    size = abs(size)
+    for unit in ('B', 'KB'):
+        if size < 1024:
+            return f"{sign}{size:.0f} {unit}"
+        size /= 1024
+    return f"{sign}{size:.1f} MB"
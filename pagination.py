@@ -0,0 +1,75 @@
+# pagination.py
+
+import re
+import threading
+from hashlib import blake2b
+from logging_setup import log_message, log_debug
+
+# Reads the visible text of every pagination control in one round trip.
+PAGINATION_TEXT_SCRIPT = """
+try {
+    return Array.from(document.querySelectorAll(arguments[0]), element => element.innerText.trim());
+} catch (e) {
+    return [];
+}
+"""
+
+def last_page_number(texts):
+    """
+    Returns the highest page number shown by a site's pagination controls.
+
+    Parameters:
+    - texts (list): Text of each pagination control ("1", "2", "…", "20", "Next").
+
+    Returns:
+    - int or None: The largest purely numeric label, or None if there is none.
+    """
+    numbers = [int(text.strip()) for text in texts if text and re.fullmatch(r'\d+', text.strip())]
+    return max(numbers) if numbers else None
+
+def pagination_texts_in_driver(driver, selector):
+    """Returns the text of every element matching the pagination selector on the driver's current page."""
+    return driver.execute_script(PAGINATION_TEXT_SCRIPT, selector) or []
+
+def row_fingerprint(row):
+    """Returns a 16-byte fingerprint of a scraped row; equal rows share it."""
+    return blake2b(repr(tuple(row)).encode('utf-8'), digest_size=16).digest()
+
+class EndOfResultsDetector:
+    """
+    Decides when a query has run out of results.
+
+    Pages must be observed in order. The run ends after `empty_limit` consecutive pages that are
+    empty or only repeat products seen on earlier pages. Seen rows are kept as 16-byte
+    fingerprints, so memory does not grow with title length.
+    """
+    def __init__(self, empty_limit=1, seen_rows=(), log_text=None):
+        self.empty_limit = max(1, empty_limit)
+        self.log_text = log_text
+        self.seen_rows = set(map(row_fingerprint, seen_rows))  # e.g. rows restored from a checkpoint
+        self.exhausted_pages = 0
+        self.last_page = None  # Highest page with results, once the end has been detected
+        self.lock = threading.Lock()
+
+    def observe(self, page_number, rows):
+        """Records a page's rows; returns True once the results are exhausted."""
+        with self.lock:
+            if self.last_page is not None:
+                return True
+
+            new_rows = set(map(row_fingerprint, rows)) - self.seen_rows
+            self.seen_rows.update(new_rows)
+            if new_rows:
+                self.exhausted_pages = 0
+                return False
+
+            self.exhausted_pages += 1
+            reason = "no products" if not rows else "only products from earlier pages"
+            log_debug(f"Page {page_number} has {reason}.", self.log_text)
+            if self.exhausted_pages < self.empty_limit:
+                return False
+
+            self.last_page = page_number - self.exhausted_pages
+            log_message(f"End of results: page {page_number} has {reason}; stopping after page {self.last_page}.",
+                        self.log_text, level="info")
+            return True
@@ -0,0 +1,185 @@
+# price_history.py
+
+import argparse
+import json
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from logging_setup import log_message
+
+HISTORY_FILE = 'price_history.db'
+LEGACY_HISTORY_FILE = 'historical_data.json'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL UNIQUE,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS prices (
+    product_id INTEGER NOT NULL REFERENCES products (id),
+    date_found TEXT NOT NULL,  -- ISO 8601, as in historical_data.json
+    price REAL,
+    secondary_price REAL,
+    PRIMARY KEY (product_id, date_found)
+) WITHOUT ROWID;
+"""
+
+class PriceHistory:
+    """
+    Per-product price series in a SQLite file.
+
+    A product's series is stored contiguously under its primary key, so reading it is a single index
+    range scan and appending a point never rewrites older data. A point is only added when a product's
+    price differs from its latest recorded one; unchanged sightings just update `last_seen`.
+
+    With a title_matcher.TitleMatcher, a reworded title ("RTX-4070 12GB" for "RTX 4070 12 GB") is
+    recorded under the known product it matches instead of starting a new series.
+    """
+    def __init__(self, path=HISTORY_FILE, log_text=None, title_matcher=None):
+        self.path = path
+        self.log_text = log_text
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self.title_matcher = title_matcher
+        if title_matcher is not None:
+            for (title,) in self.connection.execute("SELECT title FROM products ORDER BY id"):
+                title_matcher.add(title)
+
+    def record(self, rows, observed_at=None):
+        """
+        Adds the prices seen on one page.
+
+        Parameters:
+        - rows (list): (title, price, secondary price) rows; the secondary price is optional.
+        - observed_at (str, optional): ISO 8601 timestamp; defaults to now.
+
+        Returns:
+        - int: Number of price points added.
+        """
+        observed_at = observed_at or datetime.now().isoformat(timespec='seconds')
+        added = 0
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                for row in rows:
+                    title = self.title_matcher.match_or_add(row[0]) if self.title_matcher is not None else row[0]
+                    secondary_price = row[2] if len(row) > 2 else None
+                    added += self._add_point(title, row[1], secondary_price, observed_at)
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+        return added
+
+    def series(self, title):
+        """Returns a product's (date_found, price, secondary price) points, oldest first."""
+        with self.lock:
+            return self.connection.execute(
+                "SELECT prices.date_found, prices.price, prices.secondary_price FROM prices "
+                "JOIN products ON products.id = prices.product_id WHERE products.title = ? ORDER BY prices.date_found",
+                (title,)
+            ).fetchall()
+
+    def latest(self, title):
+        """Returns a product's most recent (date_found, price, secondary price) point, or None."""
+        with self.lock:
+            return self.connection.execute(
+                "SELECT prices.date_found, prices.price, prices.secondary_price FROM prices "
+                "JOIN products ON products.id = prices.product_id WHERE products.title = ? "
+                "ORDER BY prices.date_found DESC LIMIT 1",
+                (title,)
+            ).fetchone()
+
+    def import_json(self, filename=LEGACY_HISTORY_FILE):
+        """
+        Imports a historical_data.json document ({"products": [{"product_title", "prices": [...]}]}).
+
+        Points that are already stored are skipped, so importing the same file twice is harmless.
+
+        Returns:
+        - int: Number of price points added.
+        """
+        with open(filename, 'r', encoding='utf-8') as f:
+            products = json.load(f).get('products', [])
+
+        added = 0
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                for product in products:
+                    title = product.get('product_title')
+                    points = sorted(product.get('prices', []), key=lambda point: point.get('date_found', ''))
+                    if not title or not points:
+                        continue
+                    product_id = self._product_id(title, points[0]['date_found'], points[-1]['date_found'])
+                    for point in points:
+                        cursor = self.connection.execute(
+                            "INSERT OR IGNORE INTO prices (product_id, date_found, price, secondary_price) "
+                            "VALUES (?, ?, ?, ?)",
+                            (product_id, point['date_found'], point.get('price'), point.get('secondary_price'))
+                        )
+                        added += cursor.rowcount
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+        log_message(f"Imported {added} price points for {len(products)} products from {filename}",
+                    self.log_text, level="info")
+        return added
+
+    def close(self):
+        """Closes the database connection."""
+        with self.lock:
+            self.connection.close()
+
+    def _product_id(self, title, first_seen, last_seen):
+        self.connection.execute(
+            "INSERT INTO products (title, first_seen, last_seen) VALUES (?, ?, ?) "
+            "ON CONFLICT (title) DO UPDATE SET first_seen = MIN(first_seen, excluded.first_seen), "
+            "last_seen = MAX(last_seen, excluded.last_seen)",
+            (title, first_seen, last_seen)
+        )
+        return self.connection.execute("SELECT id FROM products WHERE title = ?", (title,)).fetchone()[0]
+
+    def _add_point(self, title, price, secondary_price, observed_at):
+        product_id = self._product_id(title, observed_at, observed_at)
+        latest = self.connection.execute(
+            "SELECT price, secondary_price FROM prices WHERE product_id = ? ORDER BY date_found DESC LIMIT 1",
+            (product_id,)
+        ).fetchone()
+        if latest == (price, secondary_price):
+            return 0
+        cursor = self.connection.execute(
+            "INSERT OR REPLACE INTO prices (product_id, date_found, price, secondary_price) VALUES (?, ?, ?, ?)",
+            (product_id, observed_at, price, secondary_price)
+        )
+        return cursor.rowcount
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import and inspect the price history database.")
+    parser.add_argument('--db', default=HISTORY_FILE, help="History database (default: %(default)s)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    import_json = commands.add_parser('import', help="Import a historical_data.json file")
+    import_json.add_argument('filename', nargs='?', default=LEGACY_HISTORY_FILE)
+    show = commands.add_parser('show', help="Print a product's price series")
+    show.add_argument('title')
+    args = parser.parse_args(argv)
+
+    history = PriceHistory(args.db)
+    try:
+        if args.command == 'import':
+            history.import_json(args.filename)
+        elif args.command == 'show':
+            for date_found, price, secondary_price in history.series(args.title):
+                print(f"{date_found}\t{price}\t{'' if secondary_price is None else secondary_price}")
+    finally:
+        history.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
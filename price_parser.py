@@ -1,64 +1,119 @@
 # price_parser.py
 
 import re
-from logging_setup import log_message, log_debug
+from functools import lru_cache
+from logging_setup import log_debug
 
-def parse_price(price_text, log_text=None):
+DECIMAL_POINT = 'decimal_point'  # 1,299.99
+DECIMAL_COMMA = 'decimal_comma'  # 1.299,99
+PRICE_LOCALES = (DECIMAL_POINT, DECIMAL_COMMA)
+
+# Currency symbols, letters and spaces are dropped; a line break inside a price separates its decimals ("12\n99")
+NON_PRICE_CHARACTERS = re.compile(r'[^\d,.\n]')
+SEPARATORS = re.compile(r'[,.]')
+DECIMAL_HINT = re.compile(r'^\d+([,.])\d{1,2}$')  # One separator followed by 1-2 digits, e.g. "12,99"
+
+def parse_price(price_text, log_text=None, locale=None):
     """
     Parses and converts price text into a numeric format, correctly handling commas, periods, and various currency symbols.
 
     Parameters:
     - price_text (str): Raw price text from web scraping.
     - log_text (tk.Text, optional): Log widget to log messages.
+    - locale (str, optional): DECIMAL_POINT or DECIMAL_COMMA; guessed from the text itself if not provided.
 
     Returns:
     - float or None: Parsed price as a floating-point number, or None if parsing failed.
     """
-    original_text = price_text.strip()
+    price = parse_price_text(price_text, locale)
+    if log_text and price is None:
+        log_debug(f"Could not parse price from '{price_text.strip()}'.", log_text)
+    return price
+
+def parse_prices(price_texts, locale=None, log_text=None):
+    """
+    Parses a whole page (or run) of price texts at once.
+
+    Each distinct text is parsed once, so repeated prices cost a dictionary lookup.
+
+    Parameters:
+    - price_texts (iterable): Raw price texts; empty or None entries give None.
+    - locale (str, optional): DECIMAL_POINT or DECIMAL_COMMA, e.g. from infer_price_locale.
+    - log_text (tk.Text, optional): Log widget to log messages.
+
+    Returns:
+    - list: Parsed prices (float or None), in input order.
+    """
+    price_texts = list(price_texts)
+    prices = dict.fromkeys(price_texts)
+    for text in prices:
+        if text:
+            prices[text] = parse_price_text(text, locale)
+
     if log_text:
-        log_debug(f"Received price text for parsing: '{original_text}'", log_text)
+        failed = sum(1 for text, price in prices.items() if text and price is None)
+        if failed:
+            log_debug(f"Could not parse {failed} of {len(prices)} distinct price texts.", log_text)
+    return [prices[text] for text in price_texts]
 
-    if not original_text:
-        if log_text:
-            log_message("Price text is empty, cannot parse.", log_text, level="warning")
+def infer_price_locale(price_texts):
+    """
+    Infers a site's decimal separator from a sample of its price texts.
+
+    Texts such as "1.299,99" or "12,99" vote for their separator; ambiguous ones such as
+    "1,299" or "49" do not vote.
+
+    Returns:
+    - str or None: DECIMAL_POINT, DECIMAL_COMMA, or None if the sample is ambiguous.
+    """
+    votes = {DECIMAL_POINT: 0, DECIMAL_COMMA: 0}
+    for text in set(price_texts):
+        if not text:
+            continue
+        separator = decimal_separator_hint(clean_price_text(text).partition('\n')[0])
+        if separator:
+            votes[DECIMAL_COMMA if separator == ',' else DECIMAL_POINT] += 1
+
+    if votes[DECIMAL_POINT] == votes[DECIMAL_COMMA]:
         return None
+    return max(votes, key=votes.get)
 
-    try:
-        # Remove currency symbols and keep only numbers, commas, and periods
-        cleaned_text = re.sub(r'[^\d,.\n]', '', original_text)
-        if log_text:
-            log_debug(f"Removed non-numeric characters: '{cleaned_text}'", log_text)
-
-        # Replace newlines and whitespace with periods (to normalize decimal points)
-        cleaned_text = cleaned_text.replace('\n', '.').replace('\r', '.').strip()
-        if log_text:
-            log_debug(f"Replaced newlines and extra spaces: '{cleaned_text}'", log_text)
-
-        # Handle cases with both commas and periods
-        if ',' in cleaned_text and '.' in cleaned_text:
-            if cleaned_text.index(',') < cleaned_text.index('.'):
-                # Comma appears before period; treat comma as thousand separator
-                cleaned_text = cleaned_text.replace(',', '')
-            else:
-                # Treat comma as decimal separator if after period
-                cleaned_text = cleaned_text.replace(',', '')
-
-        # Handle cases with only commas
-        elif ',' in cleaned_text and '.' not in cleaned_text:
-            # Single comma, no period; treat comma as decimal separator
-            if cleaned_text.count(',') == 1:
-                cleaned_text = cleaned_text.replace(',', '.')
-            else:
-                # Multiple commas; treat commas as thousand separators
-                cleaned_text = cleaned_text.replace(',', '')
-
-        # Convert to float
-        parsed_price = float(cleaned_text)
-        if log_text:
-            log_message(f"Parsed price: {parsed_price}", log_text, level="info")
-        return parsed_price
+def decimal_separator_hint(cleaned_text):
+    """Returns the separator that must be the decimal one in a cleaned price, or None if it is ambiguous."""
+    if ',' in cleaned_text and '.' in cleaned_text:
+        return ',' if cleaned_text.rindex(',') > cleaned_text.rindex('.') else '.'
+    for separator in ',.':
+        if cleaned_text.count(separator) > 1:
+            return '.' if separator == ',' else ','  # Repeated separators group thousands
+    match = DECIMAL_HINT.match(cleaned_text)
+    return match.group(1) if match else None
+
+def clean_price_text(price_text):
+    """Keeps only digits, separators and inner line breaks."""
+    return NON_PRICE_CHARACTERS.sub('', price_text).strip('\n,.')
+
+@lru_cache(maxsize=8192)
+def parse_price_text(price_text, locale=None):
+    """Memoized core of parse_price; returns None if the text holds no valid price."""
+    cleaned_text = clean_price_text(price_text)
+    if not cleaned_text:
+        return None
+
+    whole, line_break, fraction = cleaned_text.partition('\n')
+    if line_break:
+        # Split price markup ("12\n99"): everything before the break is the integer part
+        cleaned_text = SEPARATORS.sub('', whole) + '.' + re.sub(r'\D', '', fraction)
+    else:
+        if locale == DECIMAL_COMMA:
+            decimal = ','
+        elif locale == DECIMAL_POINT:
+            decimal = '.'
+        else:
+            decimal = decimal_separator_hint(cleaned_text) or (',' if ',' in cleaned_text else '.')
+        thousands = '.' if decimal == ',' else ','
+        cleaned_text = cleaned_text.replace(thousands, '').replace(decimal, '.')
 
+    try:
+        return float(cleaned_text)
     except ValueError:
-        if log_text:
-            log_error(f"Failed to parse price from '{original_text}': Format not recognized", log_text)
         return None
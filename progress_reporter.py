@@ -0,0 +1,114 @@
+# progress_reporter.py
+
+import sys
+import threading
+
+class ProgressReporter:
+    """
+    Receives progress from ScraperManager, keeping the scraping engine free of any UI toolkit.
+
+    Labels are addressed by name: 'page_number', 'containers_found', 'products_found',
+    'products_skipped', 'selector' and 'user_agent'. The base class discards every update.
+    """
+    def set_label(self, name, text):
+        """Shows a short per-page statistic."""
+
+    def set_progress(self, value):
+        """Shows overall progress as a percentage (0-100)."""
+
+    def set_status(self, message):
+        """Shows the current run status, e.g. the estimated time remaining."""
+
+    def show_results(self, rows):
+        """Shows newly extracted rows."""
+
+    def notify_complete(self, message):
+        """Tells the user the run has finished."""
+
+class TkProgressReporter(ProgressReporter):
+    """Updates Tk widgets; every change is scheduled on the Tk event loop with root.after."""
+    def __init__(self, root, status_bar=None, progress_bar=None, results_text=None, labels=None):
+        self.root = root
+        self.status_bar = status_bar
+        self.progress_bar = progress_bar
+        self.results_text = results_text
+        self.labels = labels or {}  # label name -> ttk.Label
+
+    def set_label(self, name, text):
+        label = self.labels.get(name)
+        if label is not None:
+            self.root.after(0, lambda: label.config(text=text))
+
+    def set_progress(self, value):
+        if self.progress_bar is not None:
+            self.root.after(0, lambda: self.progress_bar.config(value=value))
+
+    def set_status(self, message):
+        if self.status_bar is not None:
+            self.root.after(0, lambda: self.status_bar.config(text=message))
+
+    def show_results(self, rows):
+        if self.results_text is None or not rows:
+            return
+        text = "".join(result_line(row) + "\n" for row in rows)
+        self.root.after(0, lambda: self.results_text.insert("end", text))
+
+    def notify_complete(self, message):
+        from tkinter import messagebox
+        self.root.after(0, lambda: messagebox.showinfo("Scraping Complete", message))
+
+class ConsoleProgressReporter(ProgressReporter):
+    """Writes status lines, prefixed with the overall progress, to a stream (stdout by default)."""
+    def __init__(self, stream=None, print_results=False):
+        self.stream = stream or sys.stdout
+        self.print_results = print_results
+        self.progress = 0.0
+        self.last_status = None
+        self.lock = threading.Lock()
+
+    def set_progress(self, value):
+        self.progress = value
+
+    def set_status(self, message):
+        with self.lock:
+            if message == self.last_status:
+                return
+            self.last_status = message
+            self._write(f"[{self.progress:3.0f}%] {message}")
+
+    def show_results(self, rows):
+        if not self.print_results or not rows:
+            return
+        with self.lock:
+            for row in rows:
+                self._write("\t".join("" if value is None else str(value) for value in row))
+
+    def notify_complete(self, message):
+        with self.lock:
+            self._write(message)
+
+    def _write(self, line):
+        self.stream.write(line + "\n")
+        self.stream.flush()
+
+def result_line(row):
+    """Formats a (title, price, secondary price) row for the results view; the secondary price is optional."""
+    line = f"Title: {row[0]}, Price: {row[1]}"
+    if len(row) > 2 and row[2] is not None:
+        line += f", Secondary: {row[2]}"
+    return line
+
+class PageDetailReporter(ProgressReporter):
+    """
+    Forwards per-page labels and results to another reporter, but not progress, status or completion.
+
+    Used for the individual queries of a batch, whose combined progress the batch runner reports.
+    """
+    def __init__(self, reporter):
+        self.reporter = reporter
+
+    def set_label(self, name, text):
+        self.reporter.set_label(name, text)
+
+    def show_results(self, rows):
+        self.reporter.show_results(rows)
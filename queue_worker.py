@@ -0,0 +1,246 @@
+# queue_worker.py
+
+import argparse
+import multiprocessing
+import signal
+import sqlite3
+import sys
+import threading
+from concurrent.futures import Future
+from config_manager import CONFIG_FILE, load_config_file
+from job_queue import JobQueue, default_worker_id
+from batch_runner import query_csv_filename
+from checkpoint import run_signature
+from result_store import ResultStore
+from logging_setup import log_message, log_error
+
+def run_worker(config, queue_file, worker_id=None, stop_event=None, poll_seconds=5, exit_when_idle=True):
+    """
+    Claims (query, page) tasks from the job queue and scrapes them until the queue is drained.
+
+    Parameters:
+    - config (dict): Scraper configuration; entry_var is replaced by each task's query.
+    - queue_file (str): Path of the SQLite job queue.
+    - worker_id (str, optional): Lease owner name; defaults to host, pid and a random suffix.
+    - stop_event (threading.Event, optional): Set to stop after the current task.
+    - poll_seconds (float): Wait between claims while other workers still hold leases.
+    - exit_when_idle (bool): Return once no task is pending or leased; otherwise keep polling.
+
+    Returns:
+    - int: Number of tasks completed.
+    """
+    from scraper_manager import ScraperManager  # Imported here so spawned worker processes pay for it themselves
+
+    worker_id = worker_id or default_worker_id()
+    job_queue = JobQueue(queue_file,
+                         lease_seconds=int(config.get('job_lease_seconds_var', 300) or 300),
+                         max_attempts=int(config.get('job_max_attempts_var', 3) or 3))
+    # The queue decides which pages exist, so per-run checkpoints and end-of-results tracking are off
+    manager = ScraperManager(dict(config, checkpoint_var=False, stop_at_end_of_results_var=False))
+    if stop_event is not None:
+        manager.stop_event = stop_event
+    manager.prepare_run(stream_results=False)  # Rows go to the queue; `export` writes the CSV files
+    manager.prepare_price_history()
+    open_result_store(manager)
+    store_runs = {}  # query -> result store run id
+    driver = None
+    completed = 0
+    log_message(f"Worker {worker_id} started on {queue_file}", None, level="info")
+
+    try:
+        while not manager.stop_event.is_set():
+            task = job_queue.claim(worker_id)
+            if task is None:
+                if exit_when_idle and not job_queue.has_unfinished():
+                    break
+                manager.stop_event.wait(poll_seconds)
+                continue
+
+            task_id, query, page_number = task
+            if driver is None and manager.http_fetcher is None:
+                driver = manager.launch_driver()
+                if driver is None:
+                    job_queue.fail(task_id, worker_id, "Failed to initialize WebDriver.")
+                    break
+
+            manager.config['entry_var'] = query
+            manager.last_page = sys.maxsize  # Lowered by the pagination controls, if they show a last page
+            manager.pagination_checked = False
+            manager.interrupted_pages.discard(page_number)
+            try:
+                with LeaseRenewer(queue_file, job_queue.lease_seconds, task_id, worker_id):
+                    rows = manager.scrape_page(driver, page_number)
+                    if isinstance(rows, Future):
+                        rows = rows.result()
+                if manager.stop_event.is_set() or page_number in manager.interrupted_pages:
+                    # Stopped mid-page: the rows may be partial, so another worker scrapes the page again
+                    log_message(f"Stopped during '{query}' page {page_number}; returned it to the queue.",
+                                None, level="warning")
+                    job_queue.release(task_id, worker_id)
+                    break
+                if rows is None:
+                    raise RuntimeError("Page produced no results.")
+            except Exception as e:
+                if manager.stop_event.is_set():
+                    job_queue.release(task_id, worker_id)  # A stop during the load is not a failed attempt
+                    break
+                log_error(f"Task '{query}' page {page_number} failed: {e}", None)
+                job_queue.fail(task_id, worker_id, e)
+                if driver is not None:
+                    manager.close_driver(driver)  # Start the next task on a fresh driver
+                    driver = None
+                continue
+
+            if not job_queue.complete(task_id, worker_id, rows):
+                log_message(f"Lease on '{query}' page {page_number} expired; result discarded.", None, level="warning")
+                continue
+            completed += 1
+            log_message(f"'{query}' page {page_number}: {len(rows)} rows", None, level="info")
+            if manager.last_page < sys.maxsize:
+                job_queue.skip_pages_after(query, manager.last_page)
+            elif not rows:
+                # A bot wall or a page that never finished loading looks the same as the end of the results,
+                # so without a last page from the pagination controls the later pages are still scraped
+                log_message(f"'{query}' page {page_number} is empty; keeping later pages, since the pagination "
+                            f"shows no last page.", None, level="warning")
+            record_task_rows(manager, job_queue, store_runs, query, page_number, rows)
+    finally:
+        if driver is not None:
+            manager.close_driver(driver)
+        manager.close_run_resources()
+        job_queue.close()
+
+    log_message(f"Worker {worker_id} finished after {completed} tasks.", None, level="info")
+    return completed
+
+class LeaseRenewer:
+    """
+    Keeps renewing a task's lease while the page is scraped.
+
+    Retry backoff and a tripped circuit breaker can hold one page longer than `job_lease_seconds_var`;
+    without renewal another worker would claim the page and this worker's result would be discarded.
+    The renewals run on their own thread and queue connection, since SQLite connections are per thread.
+    """
+    def __init__(self, queue_file, lease_seconds, task_id, worker_id):
+        self.queue_file = queue_file
+        self.lease_seconds = lease_seconds
+        self.task_id = task_id
+        self.worker_id = worker_id
+        self.done = threading.Event()
+        self.thread = None
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self._renew, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.done.set()
+        self.thread.join()
+        return False
+
+    def _renew(self):
+        job_queue = JobQueue(self.queue_file, lease_seconds=self.lease_seconds)
+        try:
+            while not self.done.wait(max(1.0, self.lease_seconds / 3)):
+                if not job_queue.renew(self.task_id, self.worker_id):
+                    break
+        except Exception as e:
+            log_error(f"Could not renew the lease on task {self.task_id}: {e}", None)
+        finally:
+            job_queue.close()
+
+def open_result_store(manager):
+    """Open the SQLite result store on the manager when sqlite_db_var is set; runs are started per query."""
+    db_file = manager.config.get('sqlite_db_var', '')
+    if not db_file:
+        return
+    try:
+        manager.result_store = ResultStore(db_file)
+    except sqlite3.Error as e:
+        log_error(f"Could not open result database '{db_file}': {e}; rows stay in the queue only.", None)
+
+def record_task_rows(manager, job_queue, store_runs, query, page_number, rows):
+    """Feed a finished task's rows to the price history and the result store, as an interactive run does."""
+    try:
+        if manager.result_store:
+            run_id = store_runs.get(query)
+            if run_id is None:
+                # Workers scraping the same query continue one unfinished store run, matched by its signature
+                run_id = store_runs[query] = manager.result_store.start_run(query, run_signature(manager.config), resume=True)
+            manager.result_store.add_page(run_id, query, page_number, rows)
+            counts = job_queue.counts(query)
+            if not counts.get('pending') and not counts.get('leased'):
+                manager.result_store.finish_run(store_runs.pop(query))
+        if manager.price_history and rows:
+            manager.price_history.record(rows)
+    except sqlite3.Error as e:
+        log_error(f"Could not record '{query}' page {page_number} in the databases: {e}", None)
+
+def _worker_process(config, queue_file, poll_seconds, exit_when_idle):
+    stop_event = threading.Event()
+    signal.signal(signal.SIGINT, lambda signum, frame: stop_event.set())
+    run_worker(config, queue_file, stop_event=stop_event, poll_seconds=poll_seconds, exit_when_idle=exit_when_idle)
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Durable (query, page) job queue for headless scraper workers.")
+    parser.add_argument('--config', default=CONFIG_FILE, help="Configuration file (default: %(default)s)")
+    parser.add_argument('--queue', help="Queue database; defaults to job_queue_db_var or job_queue.db")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    enqueue = commands.add_parser('enqueue', help="Queue pages 1..N of one or more queries")
+    enqueue.add_argument('queries', nargs='+')
+    enqueue.add_argument('--pages', type=int, help="Pages per query; defaults to max_pages_var")
+
+    import_jobs = commands.add_parser('import', help="Queue jobs from a JSON Lines file of {\"query\", \"max_pages\"} objects")
+    import_jobs.add_argument('filename')
+
+    work = commands.add_parser('work', help="Scrape queued tasks until the queue is drained")
+    work.add_argument('--processes', type=int, default=1, help="Worker processes on this machine, one browser each")
+    work.add_argument('--poll', type=float, default=5, help="Seconds between claims while other workers hold leases")
+    work.add_argument('--forever', action='store_true', help="Keep polling for new tasks instead of exiting when idle")
+
+    commands.add_parser('status', help="Show task counts per query and status")
+
+    export = commands.add_parser('export', help="Write each query's finished rows to its own CSV file")
+    export.add_argument('--output', help="Base CSV name; defaults to csv_filename_var (one file per query)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = load_config_file(config_file=args.config)
+    queue_file = args.queue or config.get('job_queue_db_var') or 'job_queue.db'
+
+    if args.command == 'work':
+        processes = [multiprocessing.Process(target=_worker_process, args=(config, queue_file, args.poll, not args.forever))
+                     for _ in range(max(1, args.processes))]
+        for process in processes:
+            process.start()
+        signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C reaches every worker, which finishes its current task
+        for process in processes:
+            process.join()
+        return 0
+
+    job_queue = JobQueue(queue_file, max_attempts=int(config.get('job_max_attempts_var', 3) or 3))
+    try:
+        if args.command == 'enqueue':
+            pages = args.pages or int(config.get('max_pages_var', 1) or 1)
+            for query in args.queries:
+                job_queue.enqueue(query, range(1, pages + 1))
+        elif args.command == 'import':
+            print(f"Queued {job_queue.import_jsonl(args.filename)} tasks.")
+        elif args.command == 'status':
+            for query in job_queue.queries():
+                counts = job_queue.counts(query)
+                print(f"{query}: " + ", ".join(f"{status} {count}" for status, count in sorted(counts.items())))
+        elif args.command == 'export':
+            base_name = args.output or config.get('csv_filename_var', 'scraped_data.csv')
+            for query in job_queue.queries():
+                job_queue.export_csv(query, query_csv_filename(base_name, query))
+    finally:
+        job_queue.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
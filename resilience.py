@@ -0,0 +1,94 @@
+# resilience.py
+
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+from logging_setup import log_message
+
+class RetryPolicy:
+    """
+    Exponential backoff with jitter for failed page loads.
+
+    The n-th retry waits between half and all of base_delay * 2**(n-1) seconds, capped at
+    max_delay, so workers that failed together do not retry in lockstep.
+    """
+    def __init__(self, max_attempts=3, base_delay=2, max_delay=60):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = max(0.0, float(base_delay))
+        self.max_delay = max(0.0, float(max_delay))
+        self.retries = 0
+        self.failures = 0  # Loads that still failed after every attempt
+        self.lock = threading.Lock()
+
+    def delay(self, attempt):
+        """Returns the wait in seconds before retrying after the given (1-based) failed attempt."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    def record_retry(self):
+        with self.lock:
+            self.retries += 1
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+
+class CircuitBreaker:
+    """
+    Pauses requests to a host after `failure_threshold` consecutive failures.
+
+    While a host's circuit is open, callers of wait() block for the rest of the cooldown. After it,
+    requests resume: a success closes the circuit, another failure reopens it for a full cooldown.
+    """
+    def __init__(self, failure_threshold=5, cooldown=120, log_text=None):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown = max(0.0, float(cooldown))
+        self.log_text = log_text
+        self.failures = {}  # host -> consecutive failures
+        self.open_until = {}  # host -> monotonic time the circuit may close
+        self.trips = 0
+        self.lock = threading.Lock()
+
+    def wait(self, url, stop_event=None):
+        """
+        Blocks while the URL's host is paused.
+
+        Returns:
+        - bool: False if stop_event was set while waiting.
+        """
+        host = urlsplit(url).hostname or ''
+        while True:
+            with self.lock:
+                remaining = self.open_until.get(host, 0) - time.monotonic()
+            if remaining <= 0:
+                return True
+            if stop_event is None:
+                time.sleep(remaining)
+            elif stop_event.wait(remaining):
+                return False
+
+    def record_success(self, url):
+        host = urlsplit(url).hostname or ''
+        with self.lock:
+            self.failures.pop(host, None)
+            self.open_until.pop(host, None)
+
+    def record_failure(self, url):
+        """Counts a failed request; returns True if it opened the host's circuit."""
+        host = urlsplit(url).hostname or ''
+        with self.lock:
+            failures = self.failures.get(host, 0) + 1
+            self.failures[host] = failures
+            if failures < self.failure_threshold or self.open_until.get(host, 0) > time.monotonic():
+                return False
+            self.open_until[host] = time.monotonic() + self.cooldown
+            self.trips += 1
+        log_message(f"{failures} consecutive failures on {host}; pausing it for {self.cooldown:g} s.",
+                    self.log_text, level="warning")
+        return True
+
+def resilience_summary(retry_policy, circuit_breaker):
+    """One-line summary of retries, pages that failed for good, and circuit breaker trips."""
+    return (f"Retries: {retry_policy.retries}, failed pages: {retry_policy.failures}, "
+            f"circuit breaker trips: {circuit_breaker.trips}")
@@ -0,0 +1,117 @@
+# result_store.py
+
+import sqlite3
+import threading
+import time
+from logging_setup import log_message
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    query TEXT NOT NULL,
+    signature TEXT NOT NULL,  -- checkpoint.run_signature, so a resumed run continues the same run
+    started REAL NOT NULL,
+    finished REAL
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    query TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    price REAL,
+    secondary_price REAL,
+    scraped_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_title ON results (title, scraped_at);
+CREATE INDEX IF NOT EXISTS results_run ON results (run_id, page);
+CREATE INDEX IF NOT EXISTS runs_signature ON runs (signature, finished);
+"""
+
+class ResultStore:
+    """
+    Scrape results in a SQLite database, one row per product per page per run.
+
+    Each page is inserted in a single transaction. The database runs in WAL mode, so analysis
+    queries can read it while a scraper is writing.
+    """
+    def __init__(self, path, log_text=None):
+        self.path = path
+        self.log_text = log_text
+        # Pages are recorded from worker threads; the lock serializes them on one connection
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.lock = threading.Lock()
+
+    def start_run(self, query, signature, resume=False):
+        """
+        Registers a run, or with resume=True continues the latest unfinished run with the same signature.
+
+        Returns:
+        - int: Run id.
+        """
+        with self.lock:
+            if resume:
+                row = self.connection.execute(
+                    "SELECT id FROM runs WHERE signature = ? AND finished IS NULL ORDER BY id DESC LIMIT 1",
+                    (signature,)
+                ).fetchone()
+                if row:
+                    return row[0]
+            cursor = self.connection.execute(
+                "INSERT INTO runs (query, signature, started) VALUES (?, ?, ?)", (query, signature, time.time())
+            )
+            return cursor.lastrowid
+
+    def add_page(self, run_id, query, page_number, rows):
+        """Stores one page's (title, price, secondary price) rows, replacing any earlier attempt at the page."""
+        scraped_at = time.time()
+        values = [(run_id, query, page_number, row[0], row[1], row[2] if len(row) > 2 else None, scraped_at)
+                  for row in rows]
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                self.connection.execute("DELETE FROM results WHERE run_id = ? AND page = ?", (run_id, page_number))
+                self.connection.executemany(
+                    "INSERT INTO results (run_id, query, page, title, price, secondary_price, scraped_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    values
+                )
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+
+    def finish_run(self, run_id):
+        """Marks a run finished; returns its row count."""
+        with self.lock:
+            self.connection.execute("UPDATE runs SET finished = ? WHERE id = ?", (time.time(), run_id))
+            count = self.connection.execute("SELECT COUNT(*) FROM results WHERE run_id = ?", (run_id,)).fetchone()[0]
+        log_message(f"Stored {count} rows for run {run_id} in {self.path}", self.log_text, level="info")
+        return count
+
+    def latest_price(self, title):
+        """
+        Returns the most recent (price, secondary price, scraped_at) for a product title, or None.
+        """
+        with self.lock:
+            return self.connection.execute(
+                "SELECT price, secondary_price, scraped_at FROM results WHERE title = ? "
+                "ORDER BY scraped_at DESC LIMIT 1",
+                (title,)
+            ).fetchone()
+
+    def run_rows(self, run_id):
+        """Returns every (page, title, price, secondary price) row of a run in page order."""
+        with self.lock:
+            return self.connection.execute(
+                "SELECT page, title, price, secondary_price FROM results WHERE run_id = ? ORDER BY page, id",
+                (run_id,)
+            ).fetchall()
+
+    def close(self):
+        """Closes the database connection."""
+        with self.lock:
+            self.connection.close()
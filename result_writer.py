@@ -0,0 +1,101 @@
+# result_writer.py
+
+import csv
+import os
+import threading
+import time
+from logging_setup import log_message, log_debug
+
+RESULT_HEADER = ("Product Title", "Primary Price", "Secondary Price")
+
+class ResultWriter:
+    """
+    Streams result rows to a CSV file while the run is going.
+
+    Rows are appended to `<filename>.part` and flushed every `flush_rows` rows or `flush_seconds`
+    seconds, whichever comes first, so the partial results can be tailed during the run. finish()
+    renames the finished file over `filename` in one step, so readers of `filename` never see a
+    half-written file.
+    """
+    def __init__(self, filename, header=RESULT_HEADER, flush_rows=200, flush_seconds=5, log_text=None):
+        self.filename = filename
+        self.part_filename = filename + '.part'
+        self.header = header
+        self.flush_rows = max(1, int(flush_rows))
+        self.flush_seconds = max(0.0, float(flush_seconds))
+        self.log_text = log_text
+        self.file = None
+        self.writer = None
+        self.rows_written = 0
+        self.unflushed_rows = 0
+        self.last_flush = time.monotonic()
+        self.lock = threading.Lock()
+
+    def open(self, rows=()):
+        """Starts a new partial file with the header and any rows carried over, e.g. from a checkpoint."""
+        directory = os.path.dirname(self.filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # A large buffer, so the flush thresholds decide when rows reach the disk
+        self.file = open(self.part_filename, mode='w', newline='', encoding='utf-8', buffering=1024 * 1024)
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.header)
+        self.rows_written = 0
+        self.write_rows(rows)
+        self.flush()
+        log_debug(f"Streaming results to {self.part_filename}", self.log_text)
+
+    def write_rows(self, rows):
+        """Appends rows, flushing once either threshold is reached."""
+        with self.lock:
+            if self.writer is None:
+                return
+            self.writer.writerows(rows)
+            self.rows_written += len(rows)
+            self.unflushed_rows += len(rows)
+            if (self.unflushed_rows >= self.flush_rows
+                    or time.monotonic() - self.last_flush >= self.flush_seconds):
+                self._flush()
+
+    def flush(self):
+        """Pushes buffered rows to the partial file."""
+        with self.lock:
+            if self.file is not None:
+                self._flush()
+
+    def finish(self):
+        """
+        Writes the remaining rows and renames the partial file to the final CSV.
+
+        Returns:
+        - bool: True if the CSV was written; False if the writer was never opened or already finished.
+        """
+        with self.lock:
+            if self.file is None:
+                return False
+            self._flush()
+            os.fsync(self.file.fileno())
+            self.file.close()
+            self.file = None
+            self.writer = None
+            os.replace(self.part_filename, self.filename)
+        log_message(f"Data saved to CSV: {self.filename} ({self.rows_written} rows)", self.log_text, level="info")
+        return True
+
+    def close(self):
+        """Finishes the CSV if any rows were written; otherwise discards the partial file, leaving an older CSV in place."""
+        if self.rows_written:
+            return self.finish()
+        with self.lock:
+            if self.file is None:
+                return False
+            self.file.close()
+            self.file = None
+            self.writer = None
+            os.remove(self.part_filename)
+        return False
+
+    def _flush(self):
+        self.file.flush()
+        self.unflushed_rows = 0
+        self.last_flush = time.monotonic()
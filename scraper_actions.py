@@ -1,12 +1,12 @@
 # scraper_actions.py
 
-import time
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from logging_setup import log_message, log_debug, log_error
 from price_parser import parse_price
+from page_readiness import wait_for_containers
 
 class ScraperActions:
     def __init__(self, driver, config, log_text, results_text):
@@ -22,7 +22,14 @@ class ScraperActions:
         try:
             log_message(f"Navigating to URL: {url}", self.log_text, level="info")
             self.driver.get(url)
-            time.sleep(int(self.config.get('scroll_delay_var', 25)) / 1000)
+            count, settle_seconds, timed_out = wait_for_containers(
+                self.driver,
+                self.config.get('container_selector_var', ''),
+                int(self.config.get('expected_containers_var', 0) or 0),
+                int(self.config.get('element_wait_timeout_var', 20) or 20)
+            )
+            log_debug(f"Page settled in {settle_seconds:.2f} s with {count} containers"
+                      f"{' (timed out)' if timed_out else ''}", self.log_text)
         except TimeoutException as e:
             log_error(f"Timeout while navigating to URL: {url}. Error: {e}", self.log_text)
         except Exception as e:
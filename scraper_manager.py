@@ -2,165 +2,974 @@
 
 import threading
 import time
-import csv
+import http.client
+import sqlite3
+from concurrent.futures import Future, ThreadPoolExecutor
 from selenium.common.exceptions import (
     NoSuchElementException, TimeoutException, WebDriverException, StaleElementReferenceException
 )
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from driver_utils import initialize_driver
-from price_parser import parse_price
+from driver_utils import initialize_driver, release_driver
+from driver_pool import DriverPool
+from http_fetcher import HttpFetcher
+from page_cache import PageCache
+from checkpoint import Checkpoint, run_signature
+from batch_runner import BatchRunner
+from user_agent_rotation import UserAgentRotator
+from resilience import RetryPolicy, CircuitBreaker, resilience_summary
+from result_writer import ResultWriter
+from result_store import ResultStore
+from price_history import PriceHistory
+from title_matcher import TitleMatcher
+from dedup import DEDUP_MODES, BloomFilter, Deduplicator
+from pagination import EndOfResultsDetector, last_page_number, pagination_texts_in_driver
+from page_weight import PageWeightMeter
+from page_readiness import CSS_SELECTOR, wait_for_containers
+from bulk_extraction import extract_page, extract_secondary_prices
+from selector_probe import SelectorProber, count_selectors_in_driver
+from config_manager import split_config_list
+from price_parser import PRICE_LOCALES, parse_prices, infer_price_locale
+from progress_reporter import ProgressReporter, PageDetailReporter
 from logging_setup import log_message, log_debug, log_error
 
 class ScraperManager:
-    def __init__(self, config, log_text, results_text, progress_bar, root,
-                 user_agent_label, status_bar, containers_found_label,
-                 page_number_label, total_products_found_label,
-                 total_products_skipped_label, selectors_found_label):
+    def __init__(self, config, log_text=None, reporter=None):
         self.config = config
         self.log_text = log_text
-        self.results_text = results_text
-        self.progress_bar = progress_bar
-        self.root = root
-        self.user_agent_label = user_agent_label
-        self.status_bar = status_bar
-        self.containers_found_label = containers_found_label
-        self.page_number_label = page_number_label
-        self.total_products_found_label = total_products_found_label
-        self.total_products_skipped_label = total_products_skipped_label
-        self.selectors_found_label = selectors_found_label
+        self.reporter = reporter or ProgressReporter()  # GUI or console output; the engine never touches widgets
         self.driver = None
         self.stop_event = threading.Event()
         self.pause_event = threading.Event()
         self.pause_event.set()
-        self.product_data = []  # Store collected product data for CSV export
+        self.restored_rows = []  # Rows of the pages restored from a checkpoint
+        self.result_writer = None  # Streams rows to the CSV file as pages finish
+        self.rows_collected = 0
+        self.result_store = None  # Optional SQLite copy of the results (sqlite_db_var)
+        self.store_run_id = None
+        self.price_history = None  # Per-product price series fed by every run (price_history_db_var)
+        self.deduplicator = None  # Drops products already seen in this run, or in any run (dedup_mode_var)
+        self.start_time = None
+        self.pages_completed = 0
+        self.http_fetcher = None
+        self.page_parser = None
+        self.parse_executor = None
+        self.fallback_drivers = []
+        self.fallback_lock = threading.Lock()
+        self.thread_state = threading.local()
+        self.async_engine = None
+        self.page_weight_meter = None
+        self.page_settle_times = {}  # page number -> seconds from navigation until containers settled
+        self.selector_prober = None
+        self.page_cache = None
+        self.checkpoint = None
+        self.first_page = 1  # Pages before this one were restored from a checkpoint
+        self.interrupted_pages = set()  # Pages cut short by Stop; never checkpointed as complete
+        self.last_page = None  # Lowered from max_pages once the end of the results is known
+        self.end_detector = None
+        self.pagination_checked = False
+        self.page_limit_lock = threading.Lock()
+        self.last_error = None  # Exception that aborted the last run, if any
+        self.batch_parent = None  # Manager that owns the shared drivers when this is one query of a batch
+        self.agent_rotator = None
+        self.retry_policy = RetryPolicy()
+        self.circuit_breaker = CircuitBreaker()
+        self.price_locale = None  # Decimal separator convention of the site, from price_locale_var or the first prices seen
 
-    def start_scraping(self):
-        """Start the scraping process."""
+    def start_scraping(self, resume=False):
+        """Start the scraping process; with resume=True, continue the last interrupted run of the same query."""
         log_message("Scraping process started", self.log_text, level="info")
         self.stop_event.clear()
         self.pause_event.set()
-        self.driver = initialize_driver(self.config.get('user_agent_var', ''), self.log_text)
+        try:
+            self.prepare_run(resume)
+        except Exception as e:
+            # Release whatever was opened before the failure, e.g. the checkpoint or the CSV file
+            self.last_error = e
+            log_error(f"Could not prepare the run: {e}", self.log_text)
+            self.update_status_bar(f"Error during scraping: {e}")
+            self.close_run_resources()
+            return
 
-        if not self.driver:
-            log_error("Failed to initialize WebDriver.", self.log_text)
+        scrape_mode = self.config.get('scrape_mode_var', 'sequential')
+        if scrape_mode == 'pool':
+            self.start_pool_scraping()
+            return
+        if scrape_mode == 'async':
+            self.start_async_scraping()
             return
 
+        if not self.http_fetcher:
+            self.driver = self.launch_driver()
+            if not self.driver:
+                self.last_error = WebDriverException("Failed to initialize WebDriver.")
+                log_error(str(self.last_error), self.log_text)
+                self.close_run_resources()
+                return
+            self.prepare_user_agent_rotation(1)
+
         try:
             max_pages = int(self.config.get('max_pages_var', 1))
             base_url = self.construct_base_url()
             self.update_status_bar("Starting scraping...")
 
-            for page_number in range(1, max_pages + 1):
-                if self.stop_event.is_set():
-                    log_message("Scraping stopped by user", self.log_text, level="warning")
-                    break
+            pending_page = None
+            try:
+                for page_number in range(self.first_page, max_pages + 1):
+                    if self.stop_event.is_set():
+                        log_message("Scraping stopped by user", self.log_text, level="warning")
+                        break
+                    if page_number > self.last_page:
+                        break
+
+                    self.handle_pause()
+                    if self.agent_rotator:
+                        self.driver = self.agent_rotator.driver_for_page(self.driver)
+                    rows = self.scrape_page(self.driver, page_number)
+                    if pending_page:
+                        previous_page, pending_page = pending_page, None
+                        self.record_page(*previous_page, max_pages)
+                    if isinstance(rows, Future):
+                        # Record the page only after the next one loads, so its offline parse overlaps that load
+                        pending_page = (page_number, rows)
+                    else:
+                        self.record_page(page_number, rows, max_pages)
+            finally:
+                if pending_page:
+                    self.record_page(*pending_page, max_pages)  # A finished page is kept even if the next one failed
+            self.finish_scraping()
 
-                self.handle_pause()
-                current_url = self.construct_url(page_number)
-                self.load_page(current_url, page_number)
+        except Exception as e:
+            self.last_error = e
+            log_error(f"Unexpected error during scraping: {e}", self.log_text)
+            self.update_status_bar(f"Error during scraping: {e}")
+        finally:
+            if self.driver:
+                # A rotated driver runs a different agent than user_agent_var; read it before the rotator closes
+                self.close_driver(self.driver, self.agent_rotator and self.agent_rotator.agent_for(self.driver))
+                self.driver = None
+            self.close_run_resources()
 
-                containers = self.extract_containers()
-                if not containers:
-                    continue
+    def start_pool_scraping(self):
+        """Scrape pages in parallel across a pool of WebDrivers."""
+        worker_count = int(self.config.get('worker_count_var', 2) or 2)
+        pool = DriverPool(worker_count, self.launch_driver, self.close_driver, self.log_text,
+                          launch_drivers=self.http_fetcher is None)
 
-                self.process_containers(containers, page_number)
+        try:
+            if not pool.start():
+                self.last_error = WebDriverException("Failed to initialize any WebDriver for the pool.")
+                log_error(str(self.last_error), self.log_text)
+                return
 
-                progress_value = (page_number / max_pages) * 100
-                self.update_progress(progress_value)
-                self.update_estimated_time(page_number, max_pages)
+            max_pages = int(self.config.get('max_pages_var', 1))
+            if self.http_fetcher is None:
+                self.prepare_user_agent_rotation(pool.worker_count)
+            self.update_status_bar(f"Starting scraping with {pool.worker_count} workers...")
+            pool.run(
+                list(range(self.first_page, max_pages + 1)),
+                self.scrape_page,
+                lambda page_number, rows: self.record_page(page_number, rows, max_pages),
+                self.stop_event,
+                self.handle_pause,
+                rotate_driver=self.agent_rotator and self.agent_rotator.driver_for_page
+            )
 
-            self.save_data_to_csv()
-            self.show_completion_message()
-            self.update_status_bar("Scraping completed.")
+            if self.stop_event.is_set():
+                log_message("Scraping stopped by user", self.log_text, level="warning")
+            self.finish_scraping()
 
         except Exception as e:
-            log_error(f"Unexpected error during scraping: {e}", self.log_text)
+            self.last_error = e
+            log_error(f"Unexpected error during pool scraping: {e}", self.log_text)
             self.update_status_bar(f"Error during scraping: {e}")
         finally:
-            if self.driver:
-                self.driver.quit()
-                log_message("WebDriver closed.", self.log_text, level="info")
+            pool.close(self.agent_rotator and self.agent_rotator.agent_for)
+            self.close_run_resources()
 
-    def handle_pause(self):
-        """Handle pause in scraping if triggered."""
-        while not self.pause_event.is_set():
+    def start_async_scraping(self):
+        """Scrape pages on the asyncio engine, throttled per host by a token bucket instead of fixed sleeps."""
+        from async_engine import AsyncScrapeEngine, HostRateLimiter  # asyncio is only imported when this mode runs
+
+        worker_count = int(self.config.get('worker_count_var', 2) or 2)
+        rate = float(self.config.get('rate_limit_var', 1) or 0)
+        burst = float(self.config.get('rate_burst_var', 1) or 1)
+        pool = DriverPool(worker_count, lambda: self.launch_driver(startup_delay=False), self.close_driver,
+                          self.log_text, launch_drivers=self.http_fetcher is None)
+
+        try:
+            if not pool.start():
+                self.last_error = WebDriverException("Failed to initialize any WebDriver for the async engine.")
+                log_error(str(self.last_error), self.log_text)
+                return
+
+            max_pages = int(self.config.get('max_pages_var', 1))
+            self.async_engine = AsyncScrapeEngine(pool.workers(), HostRateLimiter(rate, burst), self.log_text)
             if self.stop_event.is_set():
-                log_message("Scraping stopped by user during pause.", self.log_text, level="warning")
+                self.async_engine.stop()  # Stop was pressed while the drivers launched, before there was an engine to stop
+            if not self.pause_event.is_set():
+                self.async_engine.set_paused(True)
+            self.update_status_bar(f"Starting async scraping with {pool.worker_count} workers at {rate:g} requests/s per host...")
+            self.async_engine.run(
+                list(range(self.first_page, max_pages + 1)),
+                self.construct_url,
+                self.scrape_page,
+                lambda page_number, rows: self.record_page(page_number, rows, max_pages)
+            )
+
+            if self.stop_event.is_set():
+                log_message("Scraping stopped by user", self.log_text, level="warning")
+            self.finish_scraping()
+
+        except Exception as e:
+            self.last_error = e
+            log_error(f"Unexpected error during async scraping: {e}", self.log_text)
+            self.update_status_bar(f"Error during scraping: {e}")
+        finally:
+            self.async_engine = None
+            pool.close()
+            self.close_run_resources()
+
+    def prepare_run(self, resume=False, stream_results=True):
+        """Reset per-run state and set up every feature the configuration enables; stream_results=False skips the CSV."""
+        self.last_error = None
+        self.start_time = time.time()
+        self.page_settle_times = {}
+        self.price_locale = self.config.get('price_locale_var', 'auto')
+        if self.price_locale not in PRICE_LOCALES:
+            self.price_locale = None  # Inferred from the first page with unambiguous prices
+        self.prepare_resilience()
+        self.prepare_checkpoint(resume)
+        self.prepare_end_detection()
+        self.prepare_selector_probing()
+        self.prepare_fetch_mode()
+        self.prepare_page_cache()
+        self.result_writer = None
+        self.result_store = None
+        self.price_history = None
+        self.deduplicator = None
+        if stream_results:
+            self.prepare_deduplication()
+            self.prepare_result_writer()
+            self.prepare_result_store(resume)
+            self.prepare_price_history()
+        self.page_weight_meter = None
+        if self.lean_mode() or self.config.get('report_page_weight_var', False):
+            self.page_weight_meter = PageWeightMeter(self.lean_mode(), log_text=self.log_text)
+
+    def start_batch_scraping(self, resume=False):
+        """Scrape every query in batch_queries_var across one shared driver pool, writing one CSV per query."""
+        queries = split_config_list(self.config.get('batch_queries_var', []))
+        self.last_error = None
+        if not queries:
+            self.last_error = ValueError("No batch queries configured in batch_queries_var.")
+            log_error(str(self.last_error), self.log_text)
+            return
+        log_message(f"Batch scraping started for {len(queries)} queries", self.log_text, level="info")
+        BatchRunner(self, queries).run(resume)
+
+    def create_query_run(self, query, csv_filename):
+        """
+        Create a manager for one query of a batch.
+
+        It shares this manager's per-page labels, stop/pause events and driver launch settings, but has its
+        own results, checkpoint and CSV file. Combined progress is reported by the batch runner.
+        """
+        config = dict(self.config, entry_var=query, csv_filename_var=csv_filename)
+        run = ScraperManager(config, self.log_text, PageDetailReporter(self.reporter))
+        run.stop_event = self.stop_event
+        run.pause_event = self.pause_event
+        run.circuit_breaker = self.circuit_breaker  # Pauses a failing host for every query, not only the one that hit it
+        run.batch_parent = self
+        return run
+
+    def resume_scraping(self):
+        """Resume the last interrupted run of the current query from its first incomplete page."""
+        self.start_scraping(resume=True)
+
+    def prepare_resilience(self):
+        """Set up page load retries and the per-host circuit breaker; queries of a batch keep the batch's breaker."""
+        self.retry_policy = RetryPolicy(
+            self.config_int('retry_attempts_var', 3),
+            self.config_int('retry_base_delay_var', 2),
+            self.config_int('retry_max_delay_var', 60)
+        )
+        if self.batch_parent:
+            return
+        self.circuit_breaker = CircuitBreaker(
+            self.config_int('circuit_failure_threshold_var', 5),
+            self.config_int('circuit_cooldown_var', 120),
+            log_text=self.log_text
+        )
+
+    def prepare_checkpoint(self, resume):
+        """Open this run's checkpoint and, when resuming, restore the pages it already completed."""
+        self.restored_rows = []
+        self.pages_completed = 0
+        self.first_page = 1
+        self.interrupted_pages = set()
+        self.checkpoint = None
+        if not self.config.get('checkpoint_var', True):
+            if resume:
+                log_message("Checkpoints are disabled; starting from page 1.", self.log_text, level="warning")
+            return
+
+        self.checkpoint = Checkpoint(run_signature(self.config), log_text=self.log_text)
+        if resume:
+            self.first_page, self.restored_rows = self.checkpoint.resume_point()
+            if self.first_page > 1:
+                log_message(f"Resuming from page {self.first_page} with {len(self.restored_rows)} rows "
+                            f"from the previous run.", self.log_text, level="info")
+                self.display_results(self.restored_rows)
+            else:
+                log_message("No checkpoint found for this query; starting from page 1.", self.log_text, level="warning")
+        self.pages_completed = self.first_page - 1
+        self.checkpoint.open(resume=self.first_page > 1)
+
+    def prepare_end_detection(self):
+        """Reset the page cutoff and set up end-of-results detection for this run."""
+        self.last_page = self.config_int('max_pages_var', 1)
+        self.pagination_checked = False
+        self.end_detector = None
+        if self.config.get('stop_at_end_of_results_var', True):
+            self.end_detector = EndOfResultsDetector(
+                self.config_int('empty_page_limit_var', 1),
+                seen_rows=self.restored_rows,
+                log_text=self.log_text
+            )
+
+    def prepare_deduplication(self):
+        """Set up duplicate filtering per dedup_mode_var: off, run (within this run) or persistent (across runs)."""
+        mode = self.config.get('dedup_mode_var', 'run')
+        if mode not in DEDUP_MODES:
+            log_error(f"Unknown dedup mode '{mode}'; using 'run'.", self.log_text)
+            mode = 'run'
+        if mode == 'off':
+            return
+        bloom_filter = None
+        if mode == 'persistent':
+            filter_file = self.config.get('dedup_filter_var', '') or 'seen_products.bloom'
+            try:
+                bloom_filter = BloomFilter(filter_file, capacity=self.config_int('dedup_capacity_var', 1000000),
+                                           log_text=self.log_text)
+            except (OSError, ValueError) as e:
+                log_error(f"Could not load '{filter_file}': {e}; skipping duplicates within this run only.",
+                          self.log_text)
+        self.deduplicator = Deduplicator(self.config.get('url_entry_var', ''), bloom_filter,
+                                         seen_rows=self.restored_rows, log_text=self.log_text)
+
+    def prepare_result_writer(self):
+        """Start streaming this run's rows to csv_filename_var, beginning with any rows restored from the checkpoint."""
+        self.result_writer = ResultWriter(
+            self.config.get('csv_filename_var', 'scraped_data.csv'),
+            flush_rows=self.config_int('result_flush_rows_var', 200),
+            flush_seconds=self.config_int('result_flush_seconds_var', 5),
+            log_text=self.log_text
+        )
+        self.result_writer.open(self.restored_rows)
+        self.rows_collected = len(self.restored_rows)
+        self.restored_rows = []  # The end-of-results detector keeps its own copy
+
+    def prepare_result_store(self, resume):
+        """Open the SQLite result store when sqlite_db_var is set; a resumed run continues its unfinished store run."""
+        db_file = self.config.get('sqlite_db_var', '')
+        if not db_file:
+            return
+        try:
+            self.result_store = ResultStore(db_file, log_text=self.log_text)
+            self.store_run_id = self.result_store.start_run(
+                self.config.get('entry_var', ''), run_signature(self.config), resume=resume and self.first_page > 1
+            )
+        except sqlite3.Error as e:
+            log_error(f"Could not open result database '{db_file}': {e}; writing CSV only.", self.log_text)
+            self.result_store = None
+
+    def prepare_price_history(self):
+        """Open the price history database unless price_history_db_var is empty."""
+        db_file = self.config.get('price_history_db_var', 'price_history.db')
+        if not db_file:
+            return
+        title_matcher = None
+        if self.config.get('fuzzy_title_matching_var', False):
+            title_matcher = TitleMatcher(threshold=float(self.config.get('title_match_threshold_var', 0.85) or 0.85))
+        try:
+            self.price_history = PriceHistory(db_file, log_text=self.log_text, title_matcher=title_matcher)
+        except sqlite3.Error as e:
+            log_error(f"Could not open price history '{db_file}': {e}; prices will not be tracked.", self.log_text)
+
+    def limit_last_page(self, last_page):
+        """Lower the page cutoff; pages beyond it are skipped and their results discarded."""
+        with self.page_limit_lock:
+            self.last_page = min(self.last_page, last_page)
+
+    def check_pagination(self, page_number, texts_fn):
+        """Read the real page count from the site's pagination controls, once per run."""
+        selector = self.config.get('pagination_selector_var', '')
+        with self.page_limit_lock:
+            if not selector or self.pagination_checked:
                 return
-            time.sleep(0.1)
+            self.pagination_checked = True
 
-    def load_page(self, url, page_number):
-        """Load a page in the WebDriver."""
-        log_message(f"Navigating to URL: {url}", self.log_text, level="info")
         try:
-            self.driver.get(url)
-            WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
-            log_debug(f"Page {page_number} loaded successfully.", self.log_text)
-        except TimeoutException:
-            log_error(f"Timeout loading page {page_number}.", self.log_text)
+            last_page = last_page_number(texts_fn(selector))
         except WebDriverException as e:
-            log_error(f"Error loading page {page_number}: {e}", self.log_text)
+            log_debug(f"Could not read pagination controls on page {page_number}: {e}", self.log_text)
+            return
+        if last_page is None:
+            log_debug(f"No page numbers found with pagination selector '{selector}'.", self.log_text)
+            return
+        if last_page < self.last_page:
+            log_message(f"Pagination shows {last_page} pages; stopping there instead of page {self.last_page}.",
+                        self.log_text, level="info")
+            self.limit_last_page(last_page)
+
+    def config_int(self, key, default):
+        """Read an integer setting, falling back to the default when it is empty or invalid."""
+        try:
+            return int(self.config.get(key, default) or default)
+        except (TypeError, ValueError):
+            return default
+
+    def keep_driver_alive(self):
+        """Whether drivers should stay warm between runs instead of being quit."""
+        return bool(self.config.get('keep_driver_alive_var', True))
+
+    def launch_driver(self, startup_delay=True, user_agent=None):
+        """Start (or reuse) a WebDriver configured for this run, with user_agent_var unless another agent is given."""
+        return initialize_driver(
+            user_agent or self.config.get('user_agent_var', ''),
+            self.log_text,
+            reuse_driver=self.keep_driver_alive(),
+            startup_delay=startup_delay,
+            lean=self.lean_mode(),
+            blocked_hosts=split_config_list(self.config.get('blocked_hosts_var', ''))
+        )
+
+    def lean_mode(self):
+        """Whether drivers should block images, media, fonts and ad hosts."""
+        return bool(self.config.get('lean_mode_var', False))
+
+    def close_driver(self, driver, user_agent=None):
+        """Quit a driver, or keep it warm for the next run."""
+        if self.keep_driver_alive():
+            release_driver(driver, user_agent or self.config.get('user_agent_var', ''), self.log_text)
+            log_message("WebDriver kept alive for the next run.", self.log_text, level="info")
+        else:
+            driver.quit()
+            log_message("WebDriver closed.", self.log_text, level="info")
+
+    def prepare_user_agent_rotation(self, worker_count):
+        """Rotate each driver's user agent every user_agent_change_interval_var pages, using pre-warmed standby drivers."""
+        self.agent_rotator = None
+        interval = self.config_int('user_agent_change_interval_var', 0)
+        if interval <= 0:
+            return
+        user_agent = self.config.get('user_agent_var', '')
+        self.agent_rotator = UserAgentRotator(
+            lambda agent: self.launch_driver(startup_delay=False, user_agent=agent),
+            self.close_driver,
+            interval,
+            current_agent=user_agent or None,
+            workers=worker_count,
+            on_rotate=lambda agent: self.update_gui_label('user_agent', f"User-Agent: {agent}"),
+            log_text=self.log_text
+        )
+        self.update_gui_label('user_agent', f"User-Agent: {user_agent}")
+
+    def prepare_selector_probing(self):
+        """Set up container selector probing and start from the cached winner for this domain."""
+        self.selector_prober = None
+        if not self.config.get('auto_probe_selectors_var', True):
+            return
 
-    def extract_containers(self):
+        self.selector_prober = SelectorProber(
+            split_config_list(self.config.get('potential_selectors_var', [])),
+            self.config_int('expected_containers_var', 0),
+            log_text=self.log_text
+        )
+        cached_selector = self.selector_prober.cached_selector(self.construct_base_url())
+        if cached_selector and cached_selector != self.config.get('container_selector_var', ''):
+            log_message(f"Using cached container selector '{cached_selector}' for this site.", self.log_text, level="info")
+            self.config['container_selector_var'] = cached_selector
+        self.update_gui_label('selector', f"Selector: {self.config.get('container_selector_var', '')}")
+
+    def check_container_selector(self, url, page_number, container_count, count_fn):
+        """
+        Probe candidate selectors on the first page, or again when the active selector's matches collapse.
+
+        Returns:
+        - bool: True if the container selector changed and the page should be re-extracted.
+        """
+        prober = self.selector_prober
+        if not prober or not prober.needs_probe(container_count):
+            return False
+
+        current_selector = self.config.get('container_selector_var', '')
+        log_debug(f"Probing container selectors on page {page_number}.", self.log_text)
+        selector, _ = prober.probe(url, current_selector, count_fn)
+        if selector == current_selector:
+            return False
+
+        self.config['container_selector_var'] = selector
+        if self.page_parser:
+            self.page_parser.set_container_selector(selector)
+        self.update_gui_label('selector', f"Selector: {selector}")
+        return True
+
+    def prepare_fetch_mode(self):
+        """Set up the browserless HTTP path and offline HTML parsing when configured."""
+        self.http_fetcher = None
+        self.page_parser = None
+        self.parse_executor = None
+        use_http = self.config.get('fetch_mode_var', 'selenium') == 'http'
+        use_source = self.config.get('extraction_mode_var', 'elements') == 'source'
+        use_cache = self.config.get('page_cache_var', False)
+        if not (use_http or use_source or use_cache):
+            return
+
+        try:
+            from page_parser import PageParser
+        except ImportError as e:
+            log_error(f"HTML parsing needs lxml and cssselect ({e}); using Selenium queries instead.", self.log_text)
+            return
+
+        self.page_parser = PageParser(
+            self.config.get('container_selector_var', ''),
+            self.config.get('title_selector_var', ''),
+            self.config.get('price_selectors_var', ''),
+            self.config.get('secondary_price_selectors_var', ''),
+            self.config.get('secondary_price_indicator_var', '')
+        )
+        if use_source:
+            parse_workers = 1
+            if self.config.get('scrape_mode_var', 'sequential') != 'sequential':
+                parse_workers = max(1, self.config_int('worker_count_var', 1))
+            self.parse_executor = ThreadPoolExecutor(max_workers=parse_workers, thread_name_prefix='parse')
+        if not use_http:
+            return
+
+        timeout = int(self.config.get('element_wait_timeout_var', 20) or 20)
+        self.http_fetcher = HttpFetcher(self.config.get('user_agent_var', ''), timeout=timeout, log_text=self.log_text)
+        log_message("Fetching pages over HTTP; Selenium is used only as a per-page fallback.", self.log_text, level="info")
+
+    def prepare_page_cache(self):
+        """Open the on-disk page cache when enabled; cached pages are parsed offline, so it needs the HTML parser."""
+        self.page_cache = None
+        if not self.config.get('page_cache_var', False) or not self.page_parser:
+            return
+        self.page_cache = PageCache(
+            ttl_seconds=self.config_int('page_cache_ttl_var', 3600),
+            max_bytes=self.config_int('page_cache_max_mb_var', 200) * 1024 * 1024,
+            log_text=self.log_text
+        )
+
+    def close_run_resources(self):
+        """Close pooled HTTP connections, the parse thread and any fallback drivers opened during the run."""
+        if self.http_fetcher:
+            self.http_fetcher.close()
+            self.http_fetcher = None
+        if self.parse_executor:
+            self.parse_executor.shutdown(wait=True)
+            self.parse_executor = None
+        if self.checkpoint:
+            self.checkpoint.close()
+        if self.result_writer:
+            self.result_writer.close()  # Keeps the rows of a run that ended in an error
+            self.result_writer = None
+        if self.result_store:
+            self.result_store.close()
+            self.result_store = None
+        if self.price_history:
+            self.price_history.close()
+            self.price_history = None
+        if self.deduplicator:
+            try:
+                self.deduplicator.close()
+            except (OSError, ValueError) as e:
+                log_error(f"Could not save the seen-products filter: {e}", self.log_text)
+            self.deduplicator = None
+        if self.agent_rotator:
+            self.agent_rotator.close()
+            self.agent_rotator = None
+        with self.fallback_lock:
+            drivers, self.fallback_drivers = self.fallback_drivers, []
+        for driver in drivers:
+            self.close_driver(driver)
+        self.thread_state = threading.local()
+
+    def fallback_driver(self):
+        """Return this thread's Selenium driver for HTTP fallbacks, launching it on first use."""
+        if self.batch_parent:
+            return self.batch_parent.fallback_driver()  # One fallback driver per worker, shared by all queries
+        driver = getattr(self.thread_state, 'driver', None)
+        if driver is None:
+            driver = self.launch_driver()
+            if driver is None:
+                raise WebDriverException("Failed to initialize fallback WebDriver.")
+            self.thread_state.driver = driver
+            with self.fallback_lock:
+                self.fallback_drivers.append(driver)
+        return driver
+
+    def scrape_page(self, driver, page_number):
+        """
+        Load a single page on the given driver and return its (title, price, secondary price) rows.
+
+        In 'source' extraction mode the rows come back as a Future, so the next page can load
+        while this one is parsed; record_page resolves it.
+        """
+        if page_number > self.last_page:
+            return None  # Beyond the end of the results; record_page ignores it
+        current_url = self.construct_url(page_number)
+        if self.page_cache:
+            rows = self.scrape_page_cached(current_url, page_number)
+            if rows is not None:
+                return rows
+        if self.http_fetcher:
+            rows = self.scrape_page_http(current_url, page_number)
+            if rows is not None:
+                return rows
+            log_message(f"Falling back to Selenium for page {page_number}.", self.log_text, level="warning")
+            driver = driver or self.fallback_driver()
+
+        container_count = self.load_page(current_url, page_number, driver)
+        if container_count is None:
+            return None  # Failed after every retry; record_page logs it and the checkpoint leaves it incomplete
+        self.check_container_selector(current_url, page_number, container_count,
+                                      lambda selectors: count_selectors_in_driver(driver, selectors))
+        self.check_pagination(page_number, lambda selector: pagination_texts_in_driver(driver, selector))
+        if self.page_weight_meter:
+            self.page_weight_meter.measure(driver, current_url, page_number)
+
+        extraction_mode = self.config.get('extraction_mode_var', 'elements')
+        page_html = None
+        if self.page_cache or (extraction_mode == 'source' and self.parse_executor):
+            try:
+                page_html = driver.page_source
+            except WebDriverException as e:
+                log_error(f"Could not read page source for page {page_number}: {e}", self.log_text)
+        if page_html and container_count and self.page_cache:
+            self.page_cache.put(current_url, page_html)
+
+        if extraction_mode == 'script':
+            rows = self.scrape_page_script(driver, page_number)
+            if rows is not None:
+                return rows
+        elif extraction_mode == 'source' and self.parse_executor and page_html is not None:
+            # Parsing runs off the driver's thread; the caller resolves the future when recording the page
+            return self.parse_executor.submit(self.parse_page_html, page_html, page_number)
+
+        containers = self.extract_containers(driver)
+        if not containers:
+            return []
+
+        return self.process_containers(containers, page_number, driver)
+
+    def scrape_page_script(self, driver, page_number):
+        """Extract the loaded page with one injected script; returns None if the script fails."""
+        try:
+            raw_rows = extract_page(
+                driver,
+                self.config.get('container_selector_var', ''),
+                self.config.get('title_selector_var', ''),
+                self.config.get('price_selectors_var', ''),
+                self.config.get('secondary_price_indicator_var', ''),
+                self.config.get('secondary_price_selectors_var', '')
+            )
+        except WebDriverException as e:
+            log_error(f"Bulk extraction failed on page {page_number}, using element queries: {e}", self.log_text)
+            return None
+
+        self.update_gui_label('containers_found', f"Containers Found: {len(raw_rows)}")
+        log_debug(f"Found {len(raw_rows)} containers", self.log_text)
+        return self.process_raw_rows(raw_rows, page_number)
+
+    def scrape_page_http(self, url, page_number):
+        """Fetch a page over HTTP and extract its rows; returns None if the expected containers are missing."""
+        if not self.circuit_breaker.wait(url, self.stop_event):
+            return None
+        log_message(f"Fetching URL: {url}", self.log_text, level="info")
+        try:
+            status, page_html = self.http_fetcher.fetch(url)
+        except (http.client.HTTPException, OSError) as e:
+            log_error(f"Error fetching page {page_number} over HTTP: {e}", self.log_text)
+            self.circuit_breaker.record_failure(url)
+            return None
+        if status != 200:
+            log_error(f"HTTP {status} fetching page {page_number}.", self.log_text)
+            if status == 429 or status >= 500:
+                self.circuit_breaker.record_failure(url)
+            return None
+        self.circuit_breaker.record_success(url)
+
+        raw_rows = self.parse_container_rows(url, page_html, page_number)
+        if not raw_rows:
+            log_debug(f"No containers in HTTP response for page {page_number}.", self.log_text)
+            return None
+        if self.page_cache:
+            self.page_cache.put(url, page_html)
+        return self.process_parsed_rows(raw_rows, page_number)
+
+    def scrape_page_cached(self, url, page_number):
+        """Extract a page from the page cache without fetching it; returns None on a miss."""
+        page_html = self.page_cache.get(url)
+        if page_html is None:
+            return None
+        raw_rows = self.parse_container_rows(url, page_html, page_number)
+        if not raw_rows:
+            log_debug(f"No containers in cached copy of page {page_number}; fetching it again.", self.log_text)
+            return None
+        log_message(f"Using cached copy of page {page_number}: {url}", self.log_text, level="info")
+        return self.process_parsed_rows(raw_rows, page_number)
+
+    def parse_container_rows(self, url, page_html, page_number):
+        """Parse raw rows from a page's HTML, re-probing the container selector if its matches dropped."""
+        raw_rows = self.page_parser.parse(page_html)
+        if self.check_container_selector(url, page_number, len(raw_rows),
+                                         lambda selectors: self.page_parser.count_matches(page_html, selectors)):
+            raw_rows = self.page_parser.parse(page_html)
+        self.check_pagination(page_number, lambda selector: self.page_parser.texts(page_html, selector))
+        return raw_rows
+
+    def parse_page_html(self, page_html, page_number):
+        """Extract rows from a page's HTML with the precompiled selectors."""
+        return self.process_parsed_rows(self.page_parser.parse(page_html), page_number)
+
+    def process_parsed_rows(self, raw_rows, page_number):
+        """Report the container count of a parsed page and convert its raw rows."""
+        self.update_gui_label('containers_found', f"Containers Found: {len(raw_rows)}")
+        log_debug(f"Found {len(raw_rows)} containers", self.log_text)
+        return self.process_raw_rows(raw_rows, page_number)
+
+    def process_raw_rows(self, raw_rows, page_number):
+        """Turn raw (title, price text, secondary price text) triples into (title, price, secondary price) rows."""
+        rows = []
+        products_skipped = 0
+        prices = self.parse_prices([price_text for _, price_text, _ in raw_rows])
+        secondary_prices = self.parse_prices([secondary_text for _, _, secondary_text in raw_rows])
+        for (title, _, _), price, secondary_price in zip(raw_rows, prices, secondary_prices):
+            if title and price is not None:
+                rows.append((title, price, secondary_price))
+            else:
+                products_skipped += 1
+
+        self.report_page_counts(page_number, len(rows), products_skipped)
+        return rows
+
+    def parse_prices(self, price_texts):
+        """Parse a page's price texts in one batch, with the site's decimal convention once it is known."""
+        if self.price_locale is None:
+            locale = infer_price_locale(price_texts)
+            if locale:
+                log_message(f"Prices on this site use the {locale.replace('_', ' ')} convention.", self.log_text, level="info")
+                self.price_locale = locale
+        return parse_prices(price_texts, self.price_locale, self.log_text)
+
+    def report_page_counts(self, page_number, products_found, products_skipped):
+        """Show a page's found/skipped counts in the GUI."""
+        self.update_gui_label('products_found', f"Products Found: {products_found}")
+        self.update_gui_label('products_skipped', f"Products Skipped: {products_skipped}")
+        self.update_gui_label('page_number', f"Page: {page_number}")
+
+    def record_page(self, page_number, rows, max_pages):
+        """Merge a finished page's rows into the results; pages must arrive in order."""
+        if page_number > self.last_page:
+            return  # Past the end of the results
+        if isinstance(rows, Future):
+            try:
+                rows = rows.result()
+            except Exception as e:
+                log_error(f"Error parsing page {page_number}: {e}", self.log_text)
+                rows = None
+        filtered_rows = rows  # What the CSV and the results view show
+        if rows is None:
+            if self.stop_event.is_set():
+                return  # Page was never scraped because the run was stopped
+            log_error(f"Page {page_number} produced no results.", self.log_text)
+            rows = filtered_rows = []
+        elif page_number not in self.interrupted_pages:
+            if self.end_detector and self.end_detector.observe(page_number, rows):
+                self.limit_last_page(self.end_detector.last_page)
+                if page_number > self.last_page:
+                    return
+            if self.deduplicator:
+                # Only complete pages: a page cut short by Stop is scraped again on resume
+                filtered_rows = self.deduplicator.filter_rows(rows)
+            if self.checkpoint:
+                # The checkpoint restores the CSV on resume; failed pages stay incomplete so a resume retries them
+                self.checkpoint.record_page(page_number, filtered_rows)
+
+        self.result_writer.write_rows(filtered_rows)
+        # The store and the price history get every row, so products seen in earlier runs keep their history
+        if self.result_store:
+            self.result_store.add_page(self.store_run_id, self.config.get('entry_var', ''), page_number, rows)
+        if self.price_history and rows:
+            self.price_history.record(rows)
+        self.rows_collected += len(filtered_rows)
+        self.display_results(filtered_rows)
+        self.pages_completed += 1
+
+        total_pages = min(max_pages, self.last_page)
+        progress_value = (self.pages_completed / total_pages) * 100
+        self.update_progress(progress_value)
+        self.update_estimated_time(self.pages_completed, total_pages)
+
+    def finish_scraping(self, notify=True):
+        """Save results and report completion; notify=False skips the completion dialog and status bar."""
+        if self.page_weight_meter:
+            self.page_weight_meter.finish()
+        if self.page_settle_times:
+            settle_times = list(self.page_settle_times.values())
+            log_message(f"Pages settled in {sum(settle_times) / len(settle_times):.2f} s on average "
+                        f"(slowest {max(settle_times):.2f} s).", self.log_text, level="info")
+        self.save_data_to_csv()
+        run_complete = True
+        if self.checkpoint:
+            self.checkpoint.close()
+            run_complete = self.checkpoint.resume_point()[0] > self.last_page
+            if run_complete:
+                self.checkpoint.complete()
+        if self.result_store and run_complete:
+            self.result_store.finish_run(self.store_run_id)  # Unfinished runs are continued by a resume
+        if self.page_cache:
+            log_message(self.page_cache.summary(), self.log_text, level="info")
+        summary = resilience_summary(self.retry_policy, self.circuit_breaker)
+        log_message(summary, self.log_text, level="info")
+        if not notify:
+            return
+        self.show_completion_message()
+        if self.page_cache:
+            summary = f"{self.page_cache.summary()} | {summary}"
+        self.update_status_bar(f"Scraping completed. {summary}")
+
+    def handle_pause(self):
+        """Block while scraping is paused; stop_scraping releases the wait."""
+        if self.pause_event.is_set():
+            return
+        self.pause_event.wait()
+        if self.stop_event.is_set():
+            log_message("Scraping stopped by user during pause.", self.log_text, level="warning")
+
+    def load_page(self, url, page_number, driver=None):
+        """
+        Load a page in the WebDriver and wait until its product containers have settled.
+
+        Failed loads are retried with exponential backoff, and wait while the host's circuit breaker is open.
+
+        Returns:
+        - int or None: Number of containers present, or None if the page failed to load.
+        """
+        driver = driver or self.driver
+        timeout = self.config_int('element_wait_timeout_var', 20)
+        attempts = self.retry_policy.max_attempts
+        for attempt in range(1, attempts + 1):
+            if not self.circuit_breaker.wait(url, self.stop_event):
+                return None
+            log_message(f"Navigating to URL: {url}", self.log_text, level="info")
+            try:
+                started = time.monotonic()
+                driver.get(url)
+                count, _, timed_out = wait_for_containers(
+                    driver,
+                    self.config.get('container_selector_var', ''),
+                    self.config_int('expected_containers_var', 0),
+                    timeout
+                )
+                settle_seconds = time.monotonic() - started
+                self.page_settle_times[page_number] = settle_seconds
+                if timed_out:
+                    log_message(f"Page {page_number} did not settle within {timeout} s; {count} containers present.",
+                                self.log_text, level="warning")
+                else:
+                    log_debug(f"Page {page_number} settled in {settle_seconds:.2f} s with {count} containers.", self.log_text)
+                self.circuit_breaker.record_success(url)
+                return count
+            except TimeoutException:
+                log_error(f"Timeout loading page {page_number} (attempt {attempt}/{attempts}).", self.log_text)
+            except WebDriverException as e:
+                log_error(f"Error loading page {page_number} (attempt {attempt}/{attempts}): {e}", self.log_text)
+
+            self.circuit_breaker.record_failure(url)
+            if attempt == attempts:
+                break
+            delay = self.retry_policy.delay(attempt)
+            log_message(f"Retrying page {page_number} in {delay:.1f} s.", self.log_text, level="warning")
+            self.retry_policy.record_retry()
+            if self.stop_event.wait(delay):
+                return None
+
+        self.retry_policy.record_failure()
+        return None
+
+    def extract_containers(self, driver=None):
         """Extract product containers from the current page."""
+        driver = driver or self.driver
         container_selector = self.config.get('container_selector_var', '')
         try:
-            containers = self.driver.find_elements(By.CSS_SELECTOR, container_selector)
-            self.update_gui_label(self.containers_found_label, f"Containers Found: {len(containers)}")
+            containers = driver.find_elements(CSS_SELECTOR, container_selector)
+            self.update_gui_label('containers_found', f"Containers Found: {len(containers)}")
             log_debug(f"Found {len(containers)} containers", self.log_text)
             return containers
         except NoSuchElementException:
             log_error(f"No containers found with selector '{container_selector}'", self.log_text)
             return []
 
-    def process_containers(self, containers, page_number):
-        """Process each product container to extract data."""
-        products_found = 0
-        products_skipped = 0
+    def process_containers(self, containers, page_number, driver=None):
+        """Process each product container and return the extracted (title, price, secondary price) rows."""
+        raw_rows = []
+        secondary_texts = self.read_secondary_prices(driver or self.driver, len(containers), page_number)
 
-        for container in containers:
+        for container, secondary_text in zip(containers, secondary_texts):
             if self.stop_event.is_set():
                 log_message("Scraping stopped by user during container processing.", self.log_text, level="warning")
-                return
+                self.interrupted_pages.add(page_number)
+                break
 
             try:
-                title, price = self.extract_product_data(container)
-                if title and price is not None:
-                    self.product_data.append((title, price))  # Save for CSV
-                    self.results_text.insert("end", f"Title: {title}, Price: {price}\n")
-                    products_found += 1
-                else:
-                    products_skipped += 1
-
+                raw_rows.append((*self.extract_product_data(container), secondary_text))
+            except StaleElementReferenceException:
+                log_debug("Container went stale while reading it, skipping", self.log_text)
+                raw_rows.append((None, None, None))
             except Exception as e:
                 log_error(f"Unexpected error processing container: {e}", self.log_text)
 
-        self.update_gui_label(self.total_products_found_label, f"Products Found: {products_found}")
-        self.update_gui_label(self.total_products_skipped_label, f"Products Skipped: {products_skipped}")
-        self.update_gui_label(self.page_number_label, f"Page: {page_number}")
+        return self.process_raw_rows(raw_rows, page_number)
+
+    def read_secondary_prices(self, driver, container_count, page_number):
+        """Read every container's secondary price text with one script call, aligned with the container list."""
+        secondary_texts = []
+        if self.config.get('secondary_price_selectors_var', ''):
+            try:
+                secondary_texts = extract_secondary_prices(
+                    driver,
+                    self.config.get('container_selector_var', ''),
+                    self.config.get('secondary_price_indicator_var', ''),
+                    self.config.get('secondary_price_selectors_var', '')
+                )
+            except WebDriverException as e:
+                log_debug(f"Could not read secondary prices on page {page_number}: {e}", self.log_text)
+            if secondary_texts and len(secondary_texts) != container_count:
+                log_debug(f"Page {page_number} changed while reading secondary prices; skipping them.", self.log_text)
+                secondary_texts = []
+        return secondary_texts or [None] * container_count
 
     def extract_product_data(self, container):
-        """Extract product title and price from a container."""
+        """Extract product title and raw price text from a container; prices are parsed per page."""
         title_selector = self.config.get('title_selector_var', '')
         price_selector = self.config.get('price_selectors_var', '')
 
         try:
-            title_element = container.find_element(By.CSS_SELECTOR, title_selector)
+            title_element = container.find_element(CSS_SELECTOR, title_selector)
             title = title_element.text.strip()
 
-            price_element = container.find_element(By.CSS_SELECTOR, price_selector)
-            price_text = price_element.text.strip()
-            price = parse_price(price_text, self.log_text)
-            return title, price
+            price_element = container.find_element(CSS_SELECTOR, price_selector)
+            return title, price_element.text.strip()
         except NoSuchElementException:
             log_debug("Missing title or price element, skipping container", self.log_text)
             return None, None
 
     def construct_base_url(self):
-        """Construct the base URL from configuration."""
-        base_url = self.config.get('url_entry_var', '') + self.config.get('url_path_var', '')
+        """Construct the base URL, including the search query, from configuration."""
+        base_url = (self.config.get('url_entry_var', '') + self.config.get('url_path_var', '')
+                    + self.config.get('entry_var', ''))
         log_debug(f"Constructed base URL: {base_url}", self.log_text)
         return base_url
 
@@ -170,42 +979,50 @@ class ScraperManager:
         return f"{self.construct_base_url()}{page_param}{page_number}"
 
     def save_data_to_csv(self):
-        """Save the collected data to a CSV file."""
-        filename = self.config.get('csv_filename_var', 'scraped_data.csv')
-        with open(filename, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            writer.writerow(["Product Title", "Primary Price"])
-            writer.writerows(self.product_data)
-        log_message(f"Data saved to CSV: {filename}", self.log_text, level="info")
+        """Finish the streamed CSV file, replacing csv_filename_var in one step."""
+        if self.result_writer:
+            self.result_writer.finish()
+
+    def display_results(self, rows):
+        """Show extracted rows through the progress reporter."""
+        self.reporter.show_results(rows)
 
     def update_progress(self, value):
-        """Update the progress bar in the GUI."""
-        self.root.after(0, lambda: self.progress_bar.config(value=value))
+        """Update the overall progress percentage."""
+        self.reporter.set_progress(value)
 
     def update_estimated_time(self, page_number, max_pages):
         """Update estimated time remaining based on current progress."""
         elapsed_time = time.time() - self.start_time
         remaining_pages = max_pages - page_number
-        estimated_time = (elapsed_time / page_number) * remaining_pages
+        pages_this_run = max(1, page_number - (self.first_page - 1))
+        estimated_time = (elapsed_time / pages_this_run) * remaining_pages
         mins, secs = divmod(int(estimated_time), 60)
-        self.update_status_bar(f"Estimated time remaining: {mins}m {secs}s")
+        status = f"Estimated time remaining: {mins}m {secs}s"
+        if self.page_cache:
+            status += f" | {self.page_cache.summary()}"
+        if self.retry_policy.retries or self.circuit_breaker.trips:
+            status += f" | {resilience_summary(self.retry_policy, self.circuit_breaker)}"
+        self.update_status_bar(status)
 
-    def update_gui_label(self, label, text):
-        """Update a GUI label asynchronously."""
-        self.root.after(0, lambda: label.config(text=text))
+    def update_gui_label(self, name, text):
+        """Update a named statistic label ('page_number', 'containers_found', ...)."""
+        self.reporter.set_label(name, text)
 
     def update_status_bar(self, message):
-        """Update the status bar asynchronously."""
-        self.root.after(0, lambda: self.status_bar.config(text=message))
+        """Update the status line."""
+        self.reporter.set_status(message)
 
     def show_completion_message(self):
-        """Show a completion message in the GUI."""
-        from tkinter import messagebox
-        self.root.after(0, lambda: messagebox.showinfo("Scraping Complete", "Scraping process completed successfully."))
+        """Tell the user the run has finished."""
+        self.reporter.notify_complete("Scraping process completed successfully.")
 
     def stop_scraping(self):
         """Stops the scraping process gracefully."""
         self.stop_event.set()
+        self.pause_event.set()  # Release workers waiting in handle_pause
+        if self.async_engine:
+            self.async_engine.stop()
         log_message("Scraping stopped by user.", self.log_text, level="info")
 
     def toggle_pause(self):
@@ -216,3 +1033,5 @@ class ScraperManager:
         else:
             self.pause_event.set()
             log_message("Scraping resumed.", self.log_text, level="info")
+        if self.async_engine:
+            self.async_engine.set_paused(not self.pause_event.is_set())
@@ -0,0 +1,122 @@
+# selector_probe.py
+
+import json
+import os
+import threading
+from datetime import datetime
+from urllib.parse import urlsplit
+from selenium.common.exceptions import WebDriverException
+from logging_setup import log_message, log_debug, log_error
+
+CACHE_FILE = 'selector_cache.json'
+
+# Counts the matches of every candidate selector in one round trip; invalid selectors count as 0.
+COUNT_SELECTORS_SCRIPT = """
+return arguments[0].map(selector => {
+    try { return document.querySelectorAll(selector).length; } catch (e) { return 0; }
+});
+"""
+
+def count_selectors_in_driver(driver, selectors):
+    """Returns the number of elements each selector matches on the driver's current page."""
+    return driver.execute_script(COUNT_SELECTORS_SCRIPT, list(selectors))
+
+def score_selector(count, expected_count):
+    """
+    Scores a candidate container selector by its match count.
+
+    Returns:
+    - float: 0 for no matches; otherwise closeness to expected_count (1.0 is an exact hit),
+      or the raw count when no expected count is configured.
+    """
+    if count <= 0:
+        return 0.0
+    if not expected_count:
+        return float(count)
+    return 1.0 / (1.0 + abs(count - expected_count) / expected_count)
+
+class SelectorProber:
+    """
+    Chooses the container selector that best fits a site and remembers it per domain.
+
+    Candidates are probed on the first page and whenever the active selector's match count
+    drops below `drop_ratio` of what it matched when it won.
+    """
+    def __init__(self, candidates, expected_count=0, cache_file=CACHE_FILE, drop_ratio=0.5, log_text=None):
+        self.candidates = list(dict.fromkeys(candidate for candidate in candidates if candidate))
+        self.expected_count = expected_count
+        self.cache_file = cache_file
+        self.drop_ratio = drop_ratio
+        self.log_text = log_text
+        self.baseline_count = None  # Matches of the winning selector when it was chosen
+        self.lock = threading.Lock()
+
+    def cached_selector(self, url):
+        """Returns the cached winning selector for the URL's domain, if any."""
+        entry = self._load_cache().get(urlsplit(url).netloc)
+        return entry['selector'] if entry else None
+
+    def needs_probe(self, count):
+        """Whether the active selector should be (re-)probed given its latest match count."""
+        if self.baseline_count is None:
+            return True
+        return count is not None and count < self.baseline_count * self.drop_ratio
+
+    def probe(self, url, current_selector, count_fn):
+        """
+        Scores all candidates and caches the winner for the URL's domain.
+
+        Parameters:
+        - url (str): Page the counts were taken from.
+        - current_selector (str): Selector in use; kept if no candidate matches anything or counting fails.
+        - count_fn (callable): count_fn(selectors) -> list of match counts.
+
+        Returns:
+        - tuple: (winning selector, its match count).
+        """
+        with self.lock:
+            candidates = list(dict.fromkeys([current_selector] + self.candidates))
+            try:
+                counts = count_fn(candidates)
+            except WebDriverException as e:
+                # The baseline stays unset, so the next page probes again
+                log_error(f"Could not count candidate selectors on {url}; keeping '{current_selector}': {e}",
+                          self.log_text)
+                return current_selector, 0
+            scored = [(score_selector(count, self.expected_count), count, selector)
+                      for selector, count in zip(candidates, counts)]
+            for score, count, selector in scored:
+                log_debug(f"Selector '{selector}': {count} matches (score {score:.2f})", self.log_text)
+
+            # max() keeps the first of equal scores, so the current selector wins ties
+            best_score, best_count, best_selector = max(scored, key=lambda item: item[0])
+            if best_score <= 0:
+                log_message(f"No candidate container selector matched on {url}; keeping '{current_selector}'.",
+                            self.log_text, level="warning")
+                return current_selector, 0
+
+            self.baseline_count = best_count
+            if best_selector != current_selector:
+                log_message(f"Switching container selector to '{best_selector}' ({best_count} matches).",
+                            self.log_text, level="info")
+            self._store(urlsplit(url).netloc, best_selector, best_count)
+            return best_selector, best_count
+
+    def _load_cache(self):
+        if not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            log_debug(f"Ignoring unreadable selector cache: {e}", self.log_text)
+            return {}
+
+    def _store(self, domain, selector, count):
+        cache = self._load_cache()
+        cache[domain] = {'selector': selector, 'count': count, 'updated': datetime.now().isoformat(timespec='seconds')}
+        try:
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, indent=4)
+        except OSError as e:
+            log_debug(f"Could not save selector cache: {e}", self.log_text)
@@ -0,0 +1,66 @@
+# test_checkpoint.py
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checkpoint import Checkpoint, run_signature
+
+class CheckpointTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.signature = run_signature({'entry_var': 'gpu', 'url_entry_var': 'https://www.example.com'})
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def open_checkpoint(self, resume=False):
+        checkpoint = Checkpoint(self.signature, self.directory.name)
+        checkpoint.open(resume)
+        self.addCleanup(checkpoint.close)
+        return checkpoint
+
+    def test_signature_ignores_container_selector(self):
+        config = {'entry_var': 'gpu', 'container_selector_var': 'div.a'}
+        self.assertEqual(run_signature(config), run_signature(dict(config, container_selector_var='div.b')))
+        self.assertNotEqual(run_signature(config), run_signature(dict(config, entry_var='cpu')))
+
+    def test_resume_point_stops_at_first_missing_page(self):
+        checkpoint = self.open_checkpoint()
+        checkpoint.record_page(1, [("A", 1.0, None)])
+        checkpoint.record_page(2, [("B", 2.0, None)])
+        checkpoint.record_page(4, [("D", 4.0, None)])
+        checkpoint.close()
+        self.assertEqual(checkpoint.resume_point(), (3, [("A", 1.0, None), ("B", 2.0, None)]))
+
+    def test_torn_last_line_is_ignored_and_terminated_on_resume(self):
+        checkpoint = self.open_checkpoint()
+        checkpoint.record_page(1, [("A", 1.0, None)])
+        checkpoint.close()
+        with open(checkpoint.path, 'a', encoding='utf-8') as f:
+            f.write('{"page": 2, "rows": [["B", 2')  # Crash in the middle of a write
+        self.assertEqual(checkpoint.resume_point()[0], 2)
+
+        resumed = self.open_checkpoint(resume=True)
+        resumed.record_page(2, [("B", 2.0, None)])
+        resumed.close()
+        self.assertEqual(resumed.resume_point()[0], 3)
+
+    def test_fresh_run_discards_previous_pages(self):
+        checkpoint = self.open_checkpoint()
+        checkpoint.record_page(1, [("A", 1.0, None)])
+        checkpoint.close()
+        self.open_checkpoint(resume=False).close()
+        self.assertEqual(checkpoint.resume_point(), (1, []))
+
+    def test_complete_removes_the_file(self):
+        checkpoint = self.open_checkpoint()
+        checkpoint.record_page(1, [])
+        checkpoint.complete()
+        self.assertFalse(os.path.exists(checkpoint.path))
+
+if __name__ == '__main__':
+    unittest.main()
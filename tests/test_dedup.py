@@ -0,0 +1,63 @@
+# test_dedup.py
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup import BloomFilter, Deduplicator, fingerprint, site_key
+
+class DedupTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'seen.bloom')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_fingerprint_normalizes_title_and_keeps_sites_apart(self):
+        self.assertEqual(fingerprint("RTX-4070 12GB", 'https://www.example.com/s'),
+                         fingerprint("rtx 4070 12 gb", 'https://www.example.com/b'))
+        self.assertNotEqual(fingerprint("RTX 4070", 'https://www.example.com'),
+                            fingerprint("RTX 4070", 'https://www.example.de'))
+        self.assertEqual(site_key('https://www.example.com/s?k=gpu'), 'www.example.com')
+
+    def test_run_mode_drops_repeats(self):
+        deduplicator = Deduplicator('https://www.example.com', seen_rows=[("RTX 4080", 999.0, None)])
+        rows = [("RTX 4070", 599.0, None), ("RTX-4070", 589.0, None), ("RTX 4080", 999.0, None)]
+        self.assertEqual(deduplicator.filter_rows(rows), [("RTX 4070", 599.0, None)])
+        self.assertEqual(deduplicator.filter_rows([("RTX 4070", 599.0, None)]), [])
+        self.assertEqual(deduplicator.duplicates, 3)
+
+    def test_persistent_filter_remembers_products_across_runs(self):
+        first = Deduplicator('https://www.example.com', BloomFilter(self.path, capacity=1000))
+        first.filter_rows([("RTX 4070", 599.0, None)])
+        first.close()
+
+        second = Deduplicator('https://www.example.com', BloomFilter(self.path, capacity=1000))
+        self.assertEqual(second.filter_rows([("RTX 4070", 579.0, None), ("RTX 4080", 999.0, None)]),
+                         [("RTX 4080", 999.0, None)])
+        second.close()
+        self.assertEqual(BloomFilter(self.path).stored, 2)
+
+    def test_save_merges_filters_saved_meanwhile(self):
+        first = BloomFilter(self.path, capacity=1000)
+        second = BloomFilter(self.path, capacity=1000)
+        first.add(fingerprint("RTX 4070"))
+        second.add(fingerprint("RTX 4080"))
+        first.save()
+        second.save()
+        merged = BloomFilter(self.path)
+        self.assertIn(fingerprint("RTX 4070"), merged)
+        self.assertIn(fingerprint("RTX 4080"), merged)
+
+    def test_damaged_filter_file_is_rejected(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'SCRBLOOM')
+        with self.assertRaises(ValueError):
+            BloomFilter(self.path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+# test_http_fetcher.py
+
+import gzip
+import os
+import sys
+import threading
+import unittest
+import zlib
+import http.client
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from http_fetcher import HttpFetcher
+from scraper_manager import ScraperManager
+
+PAGE = "<html><body>Grafikkarte für 499,99 €</body></html>"
+
+def raw_deflate(data):
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+# path -> (Content-Encoding, Content-Type, body)
+RESPONSES = {
+    '/plain': (None, 'text/html; charset=utf-8', PAGE.encode('utf-8')),
+    '/gzip': ('gzip', 'text/html; charset=utf-8', gzip.compress(PAGE.encode('utf-8'))),
+    '/deflate': ('deflate', 'text/html; charset=utf-8', zlib.compress(PAGE.encode('utf-8'))),
+    '/raw-deflate': ('deflate', 'text/html; charset=utf-8', raw_deflate(PAGE.encode('utf-8'))),
+    '/latin-1': (None, 'text/html; charset=iso-8859-1', PAGE.replace('€', 'EUR').encode('iso-8859-1')),
+    '/unknown-charset': (None, 'text/html; charset=x-no-such-charset', PAGE.encode('utf-8')),
+    '/truncated-gzip': ('gzip', 'text/html; charset=utf-8', gzip.compress(PAGE.encode('utf-8'))[:-12]),
+}
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep connections alive between requests
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        encoding, content_type, body = RESPONSES[self.path.split('?')[0]]
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class HttpFetcherTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        cls.server.connections = set()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.connections.clear()
+        self.fetcher = HttpFetcher(timeout=5)
+
+    def tearDown(self):
+        self.fetcher.close()
+
+    def test_requests_reuse_keep_alive_connection(self):
+        for _ in range(3):
+            self.assertEqual(self.fetcher.fetch(self.base_url + '/plain'), (200, PAGE))
+        self.assertEqual(len(self.server.connections), 1)
+
+    def test_gzip_and_deflate_bodies_are_decompressed(self):
+        for path in ('/gzip', '/deflate', '/raw-deflate'):
+            with self.subTest(path=path):
+                self.assertEqual(self.fetcher.fetch(self.base_url + path), (200, PAGE))
+
+    def test_body_is_decoded_with_its_charset(self):
+        self.assertEqual(self.fetcher.fetch(self.base_url + '/latin-1'), (200, PAGE.replace('€', 'EUR')))
+
+    def test_unknown_charset_falls_back_to_utf8(self):
+        self.assertEqual(self.fetcher.fetch(self.base_url + '/unknown-charset'), (200, PAGE))
+
+    def test_truncated_gzip_is_a_failed_fetch(self):
+        with self.assertRaises(http.client.HTTPException):
+            self.fetcher.fetch(self.base_url + '/truncated-gzip')
+
+    def test_undecodable_page_falls_back_to_selenium(self):
+        manager = ScraperManager({'url_entry_var': self.base_url, 'url_path_var': '/truncated-gzip?',
+                                  'entry_var': 'k=gpu', 'page_param_var': '&page='})
+        manager.http_fetcher = self.fetcher
+        manager.last_page = 1
+        loads = []
+        manager.load_page = lambda url, page_number, driver: loads.append((url, driver))
+        driver = object()
+
+        self.assertIsNone(manager.scrape_page(driver, 1))
+        self.assertEqual(loads, [(self.base_url + '/truncated-gzip?k=gpu&page=1', driver)])
+        self.assertEqual(manager.circuit_breaker.failures, {'127.0.0.1': 1})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+# test_job_queue.py
+
+import csv
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_queue import JobQueue
+
+class JobQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.queue = JobQueue(os.path.join(self.directory.name, 'queue.db'), lease_seconds=60, max_attempts=2)
+
+    def tearDown(self):
+        self.queue.close()
+        self.directory.cleanup()
+
+    def test_enqueue_ignores_pages_already_queued(self):
+        self.assertEqual(self.queue.enqueue('gpu', [1, 2]), 2)
+        self.assertEqual(self.queue.enqueue('gpu', [2, 3]), 1)
+        self.assertEqual(self.queue.counts(), {'pending': 3})
+
+    def test_claim_leases_lowest_page_first(self):
+        self.queue.enqueue('cpu', [2])
+        self.queue.enqueue('gpu', [1, 2])
+        self.assertEqual(self.queue.claim('w1')[1:], ('gpu', 1))
+        self.assertEqual(self.queue.claim('w2')[1:], ('cpu', 2))
+        self.assertEqual(self.queue.claim('w3')[1:], ('gpu', 2))
+        self.assertIsNone(self.queue.claim('w4'))
+
+    def test_only_the_lease_holder_completes_a_task(self):
+        self.queue.enqueue('gpu', [1])
+        task_id, _, _ = self.queue.claim('w1')
+        self.assertFalse(self.queue.complete(task_id, 'w2', [("A", 1.0, None)]))
+        self.assertTrue(self.queue.complete(task_id, 'w1', [("A", 1.0, None)]))
+        self.assertEqual(self.queue.counts(), {'done': 1})
+        self.assertFalse(self.queue.has_unfinished())
+
+    def test_failed_task_is_retried_until_attempts_run_out(self):
+        self.queue.enqueue('gpu', [1])
+        task_id, _, _ = self.queue.claim('w1')
+        self.queue.fail(task_id, 'w1', "timeout")
+        self.assertEqual(self.queue.counts(), {'pending': 1})
+        task_id, _, _ = self.queue.claim('w1')
+        self.queue.fail(task_id, 'w1', "timeout")
+        self.assertEqual(self.queue.counts(), {'failed': 1})
+        self.assertIsNone(self.queue.claim('w1'))
+
+    def test_release_does_not_use_an_attempt(self):
+        self.queue.enqueue('gpu', [1])
+        for _ in range(3):
+            task_id, _, _ = self.queue.claim('w1')
+            self.queue.release(task_id, 'w1')
+        self.assertEqual(self.queue.counts(), {'pending': 1})
+
+    def test_expired_lease_can_be_claimed_by_another_worker(self):
+        self.queue.lease_seconds = 0.01
+        self.queue.enqueue('gpu', [1])
+        task_id, _, _ = self.queue.claim('w1')
+        time.sleep(0.05)
+        self.assertEqual(self.queue.claim('w2')[0], task_id)
+        self.assertFalse(self.queue.renew(task_id, 'w1'))
+        self.assertTrue(self.queue.renew(task_id, 'w2'))
+        self.assertFalse(self.queue.complete(task_id, 'w1', []))
+
+    def test_skip_pages_after_leaves_started_pages(self):
+        self.queue.enqueue('gpu', [1, 2, 3, 4])
+        self.queue.claim('w1')
+        self.queue.claim('w1')
+        self.queue.claim('w1')  # Page 3 is leased before the end of results is known
+        self.queue.skip_pages_after('gpu', 2)
+        self.assertEqual(self.queue.counts(), {'leased': 3, 'skipped': 1})
+
+    def test_export_csv_writes_done_rows_in_page_order(self):
+        self.queue.enqueue('gpu', [1, 2])
+        first = self.queue.claim('w1')
+        second = self.queue.claim('w1')
+        self.queue.complete(second[0], 'w1', [("B", 2.0, None)])
+        self.queue.complete(first[0], 'w1', [("A", 1.0, None), ("C", 3.0, 2.5)])
+        filename = os.path.join(self.directory.name, 'gpu.csv')
+        self.assertEqual(self.queue.export_csv('gpu', filename), 3)
+        with open(filename, newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[1:], [["A", "1.0", ""], ["C", "3.0", "2.5"], ["B", "2.0", ""]])
+
+    def test_import_jsonl_skips_lines_without_query(self):
+        filename = os.path.join(self.directory.name, 'jobs.jsonl')
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write('{"query": "gpu", "max_pages": 2}\n\n{"pages": [1]}\n{"query": "cpu", "pages": [3, 5]}\n')
+        self.assertEqual(self.queue.import_jsonl(filename), 4)
+        self.assertEqual(self.queue.queries(), ['cpu', 'gpu'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+# test_price_parser.py
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from price_parser import DECIMAL_COMMA, DECIMAL_POINT, infer_price_locale, parse_price, parse_prices
+
+class PriceParserTest(unittest.TestCase):
+    def test_currency_and_separators(self):
+        self.assertEqual(parse_price("$1,299.99"), 1299.99)
+        self.assertEqual(parse_price("1.299,99 €"), 1299.99)
+        self.assertEqual(parse_price("12,99 €"), 12.99)
+        self.assertEqual(parse_price("EUR 49"), 49.0)
+
+    def test_split_price_markup(self):
+        self.assertEqual(parse_price("€12\n99"), 12.99)
+        self.assertEqual(parse_price("1.299\n,99"), 1299.99)
+
+    def test_locale_decides_ambiguous_prices(self):
+        self.assertEqual(parse_price("1,299", locale=DECIMAL_POINT), 1299.0)
+        self.assertEqual(parse_price("1,299", locale=DECIMAL_COMMA), 1.299)
+        self.assertEqual(parse_price("1.299", locale=DECIMAL_COMMA), 1299.0)
+
+    def test_text_without_price(self):
+        self.assertIsNone(parse_price("Currently unavailable"))
+        self.assertIsNone(parse_price("1.2.3,4,5"))
+
+    def test_parse_prices_keeps_order_and_empty_entries(self):
+        self.assertEqual(parse_prices(["12,99 €", None, "", "12,99 €", "5 €"]), [12.99, None, None, 12.99, 5.0])
+
+    def test_infer_price_locale(self):
+        self.assertEqual(infer_price_locale(["1.299,99 €", "12,99 €", "49 €"]), DECIMAL_COMMA)
+        self.assertEqual(infer_price_locale(["$1,299.99", "$12.99"]), DECIMAL_POINT)
+        self.assertIsNone(infer_price_locale(["1,299", "49"]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+# test_result_writer.py
+
+import csv
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from result_writer import RESULT_HEADER, ResultWriter
+
+class ResultWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'results.csv')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_rows(self, filename):
+        with open(filename, newline='', encoding='utf-8') as f:
+            return list(csv.reader(f))
+
+    def test_finish_renames_partial_file(self):
+        writer = ResultWriter(self.filename)
+        writer.open([("A", 1.0, None)])
+        writer.write_rows([("B", 2.0, 1.5)])
+        self.assertFalse(os.path.exists(self.filename))
+        self.assertTrue(writer.finish())
+        self.assertFalse(os.path.exists(writer.part_filename))
+        self.assertEqual(self.read_rows(self.filename), [list(RESULT_HEADER), ["A", "1.0", ""], ["B", "2.0", "1.5"]])
+        self.assertFalse(writer.finish())
+
+    def test_rows_are_flushed_at_the_row_threshold(self):
+        writer = ResultWriter(self.filename, flush_rows=2, flush_seconds=3600)
+        writer.open()
+        writer.write_rows([("A", 1.0, None)])
+        self.assertEqual(len(self.read_rows(writer.part_filename)), 1)
+        writer.write_rows([("B", 2.0, None)])
+        self.assertEqual(len(self.read_rows(writer.part_filename)), 3)
+        writer.close()
+
+    def test_close_without_rows_keeps_older_csv(self):
+        with open(self.filename, 'w', encoding='utf-8') as f:
+            f.write("previous run\n")
+        writer = ResultWriter(self.filename)
+        writer.open()
+        self.assertFalse(writer.close())
+        self.assertFalse(os.path.exists(writer.part_filename))
+        self.assertEqual(self.read_rows(self.filename), [["previous run"]])
+
+    def test_close_with_rows_keeps_them(self):
+        writer = ResultWriter(os.path.join(self.directory.name, 'nested', 'results.csv'))
+        writer.open()
+        writer.write_rows([("A", 1.0, None)])
+        self.assertTrue(writer.close())
+        self.assertEqual(self.read_rows(writer.filename)[1:], [["A", "1.0", ""]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+# test_title_matcher.py
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from title_matcher import TitleMatcher, normalize_title
+
+class TitleMatcherTest(unittest.TestCase):
+    def test_normalize_splits_digits_from_letters(self):
+        self.assertEqual(normalize_title("NVIDIA GeForce RTX-4070, 12GB"), "nvidia geforce rtx 4070 12 gb")
+
+    def test_reworded_title_matches_known_title(self):
+        matcher = TitleMatcher()
+        matcher.add("NVIDIA GeForce RTX 4070 12 GB Graphics Card")
+        self.assertEqual(matcher.match_or_add("Graphics Card nvidia geforce RTX-4070 12GB"),
+                         "NVIDIA GeForce RTX 4070 12 GB Graphics Card")
+
+    def test_base_model_does_not_match_ti_variant(self):
+        matcher = TitleMatcher()
+        matcher.add("NVIDIA GeForce RTX 4070 Ti 12GB Graphics Card")
+        self.assertIsNone(matcher.match("NVIDIA GeForce RTX 4070 12GB Graphics Card"))
+        self.assertEqual(matcher.match_or_add("NVIDIA GeForce RTX 4070 12GB Graphics Card"),
+                         "NVIDIA GeForce RTX 4070 12GB Graphics Card")
+        self.assertEqual(len(matcher), 2)
+
+    def test_ti_variant_does_not_match_base_model(self):
+        matcher = TitleMatcher()
+        matcher.add("NVIDIA GeForce RTX 4070 12GB Graphics Card")
+        self.assertIsNone(matcher.match("NVIDIA GeForce RTX 4070 Ti 12GB Graphics Card"))
+
+    def test_different_numbers_never_match(self):
+        matcher = TitleMatcher(threshold=0.1)
+        matcher.add("NVIDIA GeForce RTX 4070 12GB Graphics Card")
+        self.assertIsNone(matcher.match("NVIDIA GeForce RTX 4070 16GB Graphics Card"))
+
+if __name__ == '__main__':
+    unittest.main()
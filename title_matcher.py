@@ -0,0 +1,126 @@
+# title_matcher.py
+
+import math
+import re
+import unicodedata
+from array import array
+from collections import Counter
+
+NON_ALPHANUMERIC = re.compile(r'[^a-z0-9]+')
+DIGIT_LETTER_BOUNDARY = re.compile(r'(?<=\d)(?=[a-z])|(?<=[a-z])(?=\d)')
+
+def normalize_title(title):
+    """
+    Reduces a title to lowercase ASCII words, e.g. "NVIDIA GeForce RTX-4070, 12GB" -> "nvidia geforce rtx 4070 12 gb".
+
+    Digits and letters are split apart, so "12GB" and "12 GB" (or "RTX4070" and "RTX 4070") match.
+    """
+    text = unicodedata.normalize('NFKD', title).encode('ascii', 'ignore').decode('ascii').lower()
+    text = DIGIT_LETTER_BOUNDARY.sub(' ', text)
+    return ' '.join(NON_ALPHANUMERIC.sub(' ', text).split())
+
+class TitleMatcher:
+    """
+    Finds the known product title that a new, slightly different title refers to.
+
+    Known titles are indexed by their words in an inverted index. A new title is compared only with
+    the titles that share its rarest words (blocking), never with the whole catalogue; words as common
+    as "gb" are left out of blocking once a rarer word has been used. Each
+    candidate is scored by IDF-weighted Jaccard similarity of the two word sets, so distinctive words
+    such as a model number count for more than "nvidia" or "graphics".
+
+    A candidate is rejected outright when the two titles differ in a word containing a digit ("4070",
+    "12") or in a word no other known title has ("ti" while only one card is a Ti). In a small
+    catalogue every word is rare, so the score alone cannot tell "RTX 4070" from "RTX 4070 Ti".
+    """
+    def __init__(self, threshold=0.85, block_words=3, max_postings=1000, max_candidates=50):
+        self.threshold = threshold
+        self.block_words = block_words  # Rarest words of a new title whose postings are scanned
+        self.max_postings = max_postings  # Longer postings are only scanned for the rarest word
+        self.max_candidates = max_candidates  # Candidates scored per new title
+        self.titles = []  # title id -> original title
+        self.word_sets = []  # title id -> tuple of word ids
+        self.word_ids = {}  # word -> word id
+        self.postings = []  # word id -> array of title ids
+        self.numeric = []  # word id -> whether the word contains a digit
+        self.normalized = {}  # normalized title -> title id, for exact matches
+
+    def __len__(self):
+        return len(self.titles)
+
+    def add(self, title):
+        """Indexes a known title and returns its id; a title that normalizes to a known one keeps that id."""
+        normalized = normalize_title(title)
+        title_id = self.normalized.get(normalized)
+        if title_id is not None:
+            return title_id
+
+        title_id = len(self.titles)
+        word_set = []
+        for word in set(normalized.split()):
+            word_id = self.word_ids.get(word)
+            if word_id is None:
+                word_id = self.word_ids[word] = len(self.postings)
+                self.postings.append(array('i'))
+                self.numeric.append(any(character.isdigit() for character in word))
+            self.postings[word_id].append(title_id)
+            word_set.append(word_id)
+        self.titles.append(title)
+        self.word_sets.append(tuple(word_set))
+        self.normalized[normalized] = title_id
+        return title_id
+
+    def match(self, title):
+        """
+        Returns (title id, score) of the best known match scoring at least the threshold, or None.
+        """
+        normalized = normalize_title(title)
+        title_id = self.normalized.get(normalized)
+        if title_id is not None:
+            return title_id, 1.0
+
+        words = set(normalized.split())
+        known = sorted((word_id for word_id in map(self.word_ids.get, words) if word_id is not None),
+                       key=lambda word_id: len(self.postings[word_id]))
+        if not known or len(known) < len(words):
+            return None  # A word no known title has distinguishes the new title from all of them
+
+        candidates = Counter(self.postings[known[0]])
+        for word_id in known[1:self.block_words]:
+            if len(self.postings[word_id]) > self.max_postings:
+                break
+            candidates.update(self.postings[word_id])
+
+        query = set(known)
+        best = None
+        for candidate, _ in candidates.most_common(self.max_candidates):
+            candidate_words = self.word_sets[candidate]
+            if self._distinguished(query.symmetric_difference(candidate_words)):
+                continue
+            score = self._similarity(query, candidate_words)
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (candidate, score)
+        return best
+
+    def match_or_add(self, title):
+        """Returns the known title a new title matches, indexing it as a new product when nothing matches."""
+        match = self.match(title)
+        if match is None:
+            return self.titles[self.add(title)]
+        return self.titles[match[0]]
+
+    def _idf(self, document_frequency):
+        return math.log((len(self.titles) + 1) / (document_frequency + 1)) + 1
+
+    def _distinguished(self, differing_words):
+        return any(self.numeric[word_id] or len(self.postings[word_id]) <= 1 for word_id in differing_words)
+
+    def _similarity(self, query, candidate_words):
+        shared = 0.0
+        union = 0.0
+        for word_id in query.union(candidate_words):
+            weight = self._idf(len(self.postings[word_id]))
+            union += weight
+            if word_id in query and word_id in candidate_words:
+                shared += weight
+        return shared / union if union else 0.0
@@ -0,0 +1,119 @@
+# user_agent_rotation.py
+
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from driver_utils import USER_AGENTS
+from logging_setup import log_message, log_debug, log_error
+
+MAX_STANDBY_FAILURES = 3  # Consecutive failed standby launches before rotation is turned off for the run
+
+class UserAgentRotator:
+    """
+    Swaps each worker's driver for one with the next user agent every `interval` pages.
+
+    Launching Firefox is the slowest part of a rotation, so the next driver is started in the
+    background while the current one is still scraping; at the interval the two are swapped and
+    the old driver is closed in the background. If the standby driver is not ready yet, the
+    current driver keeps working and the swap happens on the first page after it is.
+
+    A standby that fails to launch is retried only after a backoff of `interval` pages, doubling
+    with each consecutive failure; after MAX_STANDBY_FAILURES in a row, rotation stops for the run.
+    """
+    def __init__(self, launch_driver, close_driver, interval, current_agent=None, user_agents=USER_AGENTS,
+                 workers=1, on_rotate=None, log_text=None):
+        self.launch_driver = launch_driver  # launch_driver(user_agent) -> driver or None
+        self.close_driver = close_driver  # close_driver(driver, user_agent)
+        self.interval = max(1, int(interval))
+        self.current_agent = current_agent
+        self.on_rotate = on_rotate  # on_rotate(user_agent), called after each swap
+        self.log_text = log_text
+        start = user_agents.index(current_agent) + 1 if current_agent in user_agents else 0
+        self.agents = itertools.islice(itertools.cycle(user_agents), start, None)
+        self.slots = {}  # active driver -> {'agent', 'pages', 'standby', 'prewarm_at'}
+        self.lock = threading.Lock()
+        # One launch and one close per worker can be in flight at once
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers) * 2, thread_name_prefix='standby')
+        self.rotations = 0
+        self.launch_failures = 0  # Consecutive standby drivers that failed to start
+        self.disabled = False
+
+    def driver_for_page(self, driver):
+        """
+        Returns the driver to load the next page with: the given one, or its pre-warmed replacement.
+
+        Each worker calls this from its own thread before every page.
+        """
+        with self.lock:
+            slot = self.slots.setdefault(driver, {'agent': self.current_agent, 'pages': 0, 'standby': None,
+                                                  'prewarm_at': 0})
+            if slot['standby'] is None and not self.disabled and slot['pages'] >= slot['prewarm_at']:
+                slot['standby'] = self.prewarm()
+
+        standby = slot['standby']
+        if standby is not None and slot['pages'] >= self.interval and standby.done():
+            new_driver, user_agent = standby.result()
+            if new_driver is None:
+                self.launch_failed(slot, user_agent)
+            else:
+                with self.lock:
+                    self.launch_failures = 0
+                self.swap(driver, slot, new_driver, user_agent)
+                driver = new_driver
+                slot = self.slots[new_driver]
+
+        slot['pages'] += 1
+        return driver
+
+    def prewarm(self):
+        """Starts launching a driver with the next user agent in the background."""
+        user_agent = next(self.agents)
+        log_debug(f"Pre-warming standby driver with User-Agent: {user_agent}", self.log_text)
+        return self.executor.submit(lambda: (self.launch_driver(user_agent), user_agent))
+
+    def launch_failed(self, slot, user_agent):
+        """Backs off before the slot's next standby launch, or stops rotating after repeated failures."""
+        with self.lock:
+            slot['standby'] = None
+            self.launch_failures += 1
+            failures = self.launch_failures
+            if failures >= MAX_STANDBY_FAILURES:
+                self.disabled = True
+            else:
+                slot['prewarm_at'] = slot['pages'] + self.interval * 2 ** (failures - 1)
+        log_error(f"Standby driver with User-Agent '{user_agent}' failed to start; keeping the current one.",
+                  self.log_text)
+        if failures >= MAX_STANDBY_FAILURES:
+            log_message(f"{failures} standby drivers failed to start in a row; "
+                        f"User-Agent rotation is off for the rest of the run.", self.log_text, level="warning")
+
+    def swap(self, driver, slot, new_driver, user_agent):
+        with self.lock:
+            del self.slots[driver]
+            self.slots[new_driver] = {'agent': user_agent, 'pages': 0, 'standby': None, 'prewarm_at': 0}
+            self.rotations += 1
+        self.executor.submit(self.close_driver, driver, slot['agent'])
+        log_message(f"Rotated to User-Agent: {user_agent} after {slot['pages']} pages.", self.log_text, level="info")
+        if self.on_rotate:
+            self.on_rotate(user_agent)
+
+    def agent_for(self, driver):
+        """Returns the user agent an active driver runs with, or None for a driver the rotator has not seen."""
+        with self.lock:
+            slot = self.slots.get(driver)
+            return slot['agent'] if slot else None
+
+    def close(self):
+        """Closes every standby driver and waits for retired drivers to finish closing."""
+        with self.lock:
+            standbys = [slot['standby'] for slot in self.slots.values() if slot['standby'] is not None]
+            self.slots = {}
+        for standby in standbys:
+            if standby.cancel():
+                continue
+            new_driver, user_agent = standby.result()
+            if new_driver is not None:
+                self.close_driver(new_driver, user_agent)
+        self.executor.shutdown(wait=True)
+        if self.rotations:
+            log_debug(f"User-Agent rotated {self.rotations} times.", self.log_text)